@@ -0,0 +1,54 @@
+"""JSON encoding shared across the package: orjson when installed, stdlib json otherwise.
+
+orjson is the optional ``fast`` extra.  Both backends produce the same
+layout for the options offered here.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+
+    def dumps(
+        obj: Any, *, indent: bool = False, default: Callable[[Any], Any] | None = None
+    ) -> bytes:
+        """Serialize *obj* to UTF-8 JSON bytes.
+
+        Output is compact unless *indent* asks for two-space indentation.
+        *default* is called for objects the encoder cannot serialize,
+        dataclass instances included.
+        """
+        if indent:
+            return json.dumps(obj, indent=2, default=default).encode()
+        return json.dumps(obj, separators=(",", ":"), default=default).encode()
+
+    def loads(data: bytes | str) -> Any:
+        """Parse a JSON document from *data*."""
+        return json.loads(data)
+
+else:
+
+    def dumps(
+        obj: Any, *, indent: bool = False, default: Callable[[Any], Any] | None = None
+    ) -> bytes:
+        """Serialize *obj* to UTF-8 JSON bytes.
+
+        Output is compact unless *indent* asks for two-space indentation.
+        *default* is called for objects the encoder cannot serialize,
+        dataclass instances included.
+        """
+        option = orjson.OPT_INDENT_2 if indent else 0
+        if default is not None:
+            # orjson serializes dataclasses natively; hand them to *default*
+            # instead, as the stdlib encoder does.
+            option |= orjson.OPT_PASSTHROUGH_DATACLASS
+        return orjson.dumps(obj, default=default, option=option)
+
+    def loads(data: bytes | str) -> Any:
+        """Parse a JSON document from *data*."""
+        return orjson.loads(data)
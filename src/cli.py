@@ -8,14 +8,41 @@ import sys
 from pathlib import Path
 
 
-def build_parser() -> argparse.ArgumentParser:
+_SUBCOMMANDS = ("scan", "serve", "rehydrate")
+
+
+def _sniff_subcommand(argv: list[str]) -> str | None:
+    """Return the first known subcommand in *argv*, or ``None`` if absent."""
+    for token in argv:
+        if token.startswith("-"):
+            continue
+        return token if token in _SUBCOMMANDS else None
+    return None
+
+
+def build_parser(only: str | None = None) -> argparse.ArgumentParser:
+    """Build the CLI parser.
+
+    When *only* names a subcommand, the other subparsers are skipped so a
+    single-command invocation does not pay for building all of them.
+    """
     parser = argparse.ArgumentParser(
         prog="moltkeeper",
         description="MoltKeeper - Zero-Trust Engineering Gateway for XML anonymization",
     )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
-    # --- scan command ---
+    if only in (None, "scan"):
+        _add_scan_parser(subparsers)
+    if only in (None, "serve"):
+        _add_serve_parser(subparsers)
+    if only in (None, "rehydrate"):
+        _add_rehydrate_parser(subparsers)
+
+    return parser
+
+
+def _add_scan_parser(subparsers: argparse._SubParsersAction) -> None:
     scan_parser = subparsers.add_parser(
         "scan",
         help="Scan an XML file and generate an anonymization policy",
@@ -35,7 +62,8 @@ def build_parser() -> argparse.ArgumentParser:
         help="Path to config.yaml (default: config/default.yaml)",
     )
 
-    # --- serve command ---
+
+def _add_serve_parser(subparsers: argparse._SubParsersAction) -> None:
     serve_parser = subparsers.add_parser(
         "serve",
         help="Start the MCP server",
@@ -70,7 +98,8 @@ def build_parser() -> argparse.ArgumentParser:
         help="Path to config.yaml (default: config/default.yaml)",
     )
 
-    # --- rehydrate command ---
+
+def _add_rehydrate_parser(subparsers: argparse._SubParsersAction) -> None:
     rehydrate_parser = subparsers.add_parser(
         "rehydrate",
         help="Restore original values from a vault file",
@@ -101,8 +130,6 @@ def build_parser() -> argparse.ArgumentParser:
         help="Modify file in-place (backup created with .bak extension)",
     )
 
-    return parser
-
 
 def cmd_scan(args: argparse.Namespace) -> None:
     """Execute the *scan* sub-command."""
@@ -192,7 +219,7 @@ def cmd_rehydrate(args: argparse.Namespace) -> None:
 
 
 def main() -> None:
-    parser = build_parser()
+    parser = build_parser(only=_sniff_subcommand(sys.argv[1:]))
     args = parser.parse_args()
 
     dispatch = {
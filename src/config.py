@@ -1,53 +1,143 @@
-"""Configuration loader using Pydantic models."""
+"""Configuration loader using plain dataclasses."""
 
 from __future__ import annotations
 
+import copy
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
 
-import yaml
-from pydantic import BaseModel
 
+DEFAULT_VALUE_PATTERN = r"-?\d+\.?\d*"
 
-class MaskingConfig(BaseModel):
+
+@dataclass(slots=True, frozen=True)
+class MaskingConfig:
     """Controls how numeric values are replaced with UUID placeholders."""
 
-    value_pattern: str = r"-?\d+\.?\d*"
+    value_pattern: str = DEFAULT_VALUE_PATTERN
     uuid_format: str = "VAL_{uuid}"
-    preserve_attributes: list[str] = ["id", "type"]
+    preserve_attributes: list[str] = field(default_factory=lambda: ["id", "type"])
 
 
-class ShufflingConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ShufflingConfig:
     """Controls element reordering to break positional inference."""
 
     enabled: bool = True
     seed: int | None = None
-    target_tags: list[str] = ["element", "node", "component"]
+    target_tags: list[str] = field(default_factory=lambda: ["element", "node", "component"])
 
 
-class PolicyEngineConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class PolicyEngineConfig:
     """Top-level configuration combining masking, shuffling, and vault settings."""
 
-    masking: MaskingConfig = MaskingConfig()
-    shuffling: ShufflingConfig = ShufflingConfig()
+    masking: MaskingConfig = field(default_factory=MaskingConfig)
+    shuffling: ShufflingConfig = field(default_factory=ShufflingConfig)
     vault_path: Path = Path("./session_vault.json")
     strict_mode: bool = False
 
 
+# String spellings accepted for booleans, matching Pydantic's lax coercion.
+_TRUE_STRINGS = frozenset({"1", "on", "t", "true", "y", "yes"})
+_FALSE_STRINGS = frozenset({"0", "f", "false", "n", "no", "off"})
+
+
+def _as_bool(value: object, name: str) -> bool:
+    """Coerce a YAML value to bool, accepting quoted ``"true"``/``"false"`` and 0/1."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in _TRUE_STRINGS:
+            return True
+        if lowered in _FALSE_STRINGS:
+            return False
+    raise ValueError(f"Config value {name} must be a boolean, got {value!r}")
+
+
+def _as_int(value: object, name: str) -> int:
+    """Return *value* if it is an integer; booleans and floats are rejected."""
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"Config value {name} must be an integer, got {value!r}")
+    return value
+
+
+def _as_str(value: object, name: str) -> str:
+    """Return *value* if it is a string; ``null`` and numbers are rejected."""
+    if not isinstance(value, str):
+        raise ValueError(f"Config value {name} must be a string, got {value!r}")
+    return value
+
+
+def _as_str_list(value: object, name: str) -> list[str]:
+    """Return a copy of *value* if it is a list of strings."""
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"Config value {name} must be a list of strings, got {value!r}")
+    return list(value)
+
+
+# Parsed configs keyed by (resolved path, mtime_ns, size); an edited file
+# produces a new key, so stale entries simply age out of the LRU.
+_CONFIG_CACHE: OrderedDict[tuple[str, int, int], PolicyEngineConfig] = OrderedDict()
+_CACHE_MAX = 32
+
+
 def load_config(path: str | Path = "config/default.yaml") -> PolicyEngineConfig:
     """Load configuration from a YAML file.
 
-    Falls back to defaults if the file does not exist.
+    Falls back to defaults if the file does not exist.  Parsed results are
+    cached per file version; callers always receive their own deep copy.
     """
     config_path = Path(path)
-    if not config_path.exists():
+    try:
+        st = config_path.stat()
+    except FileNotFoundError:
         return PolicyEngineConfig()
 
+    key = (str(config_path.resolve()), st.st_mtime_ns, st.st_size)
+    cached = _CONFIG_CACHE.get(key)
+    if cached is not None:
+        _CONFIG_CACHE.move_to_end(key)
+        return copy.deepcopy(cached)
+
+    # Deferred so the default-config path never pays for importing PyYAML.
+    import yaml
+
     with open(config_path) as f:
         raw = yaml.safe_load(f) or {}
 
-    return PolicyEngineConfig(
-        masking=MaskingConfig(**raw.get("masking", {})),
-        shuffling=ShufflingConfig(**raw.get("shuffling", {})),
-        vault_path=Path(raw.get("vault", {}).get("path", "./session_vault.json")),
-        strict_mode=raw.get("strict_mode", False),
+    masking = raw.get("masking") or {}
+    shuffling = raw.get("shuffling") or {}
+    vault = raw.get("vault") or {}
+    seed = shuffling.get("seed")
+
+    config = PolicyEngineConfig(
+        masking=MaskingConfig(
+            value_pattern=_as_str(
+                masking.get("value_pattern", DEFAULT_VALUE_PATTERN), "masking.value_pattern"
+            ),
+            uuid_format=_as_str(masking.get("uuid_format", "VAL_{uuid}"), "masking.uuid_format"),
+            preserve_attributes=_as_str_list(
+                masking.get("preserve_attributes", ["id", "type"]), "masking.preserve_attributes"
+            ),
+        ),
+        shuffling=ShufflingConfig(
+            enabled=_as_bool(shuffling.get("enabled", True), "shuffling.enabled"),
+            seed=_as_int(seed, "shuffling.seed") if seed is not None else None,
+            target_tags=_as_str_list(
+                shuffling.get("target_tags", ["element", "node", "component"]),
+                "shuffling.target_tags",
+            ),
+        ),
+        vault_path=Path(_as_str(vault.get("path", "./session_vault.json"), "vault.path")),
+        strict_mode=_as_bool(raw.get("strict_mode", False), "strict_mode"),
     )
+
+    _CONFIG_CACHE[key] = config
+    if len(_CONFIG_CACHE) > _CACHE_MAX:
+        _CONFIG_CACHE.popitem(last=False)
+    return copy.deepcopy(config)
@@ -4,14 +4,17 @@ from __future__ import annotations
 
 import random
 import re
+from collections.abc import Iterable
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from lxml import etree
-
-from src.config import MaskingConfig, PolicyEngineConfig, ShufflingConfig
-from src.policy_engine import Policy, Rule
+from src.config import DEFAULT_VALUE_PATTERN, MaskingConfig, PolicyEngineConfig, ShufflingConfig
+from src.policy_engine import Policy, Rule, _localname, _may_be_number
 from src.vault import Vault
 
+if TYPE_CHECKING:
+    from lxml import etree
+
 # ---------------------------------------------------------------------------
 # Tag shadowing: replace sensitive tag names with neutral labels.
 # ---------------------------------------------------------------------------
@@ -23,6 +26,51 @@ DEFAULT_TAG_MAP: dict[str, str] = {
     "coordinates": "spatial_delta",
 }
 
+# Compiled value patterns keyed by pattern string, so repeated calls with the
+# same MaskingConfig skip re.compile.
+_PATTERN_CACHE: dict[str, re.Pattern[str]] = {}
+
+
+def _value_pattern(masking_config: MaskingConfig) -> re.Pattern[str]:
+    pattern = _PATTERN_CACHE.get(masking_config.value_pattern)
+    if pattern is None:
+        pattern = re.compile(masking_config.value_pattern)
+        _PATTERN_CACHE[masking_config.value_pattern] = pattern
+    return pattern
+
+
+# ---------------------------------------------------------------------------
+# Tag lookup: let libxml2 find target elements instead of a Python-level walk.
+# ---------------------------------------------------------------------------
+
+# Above this many names the XPath predicate stops paying for itself.
+_XPATH_MAX_TAGS = 16
+
+_XPATH_CACHE: dict[frozenset[str], etree.XPath] = {}
+
+
+def _elements_named(root: etree._Element, names: Iterable[str]) -> list[etree._Element]:
+    """Return *root* and its descendants whose local name is in *names*, in document order."""
+    from lxml import etree
+
+    key = frozenset(names)
+    if len(key) > _XPATH_MAX_TAGS:
+        return [
+            elem
+            for elem in root.iter()
+            if isinstance(elem.tag, str) and _localname(elem.tag) in key
+        ]
+
+    finder = _XPATH_CACHE.get(key)
+    if finder is None:
+        # Names containing a quote cannot be XML tag names, so they never match.
+        predicate = " or ".join(
+            f"local-name()='{name}'" for name in sorted(key) if "'" not in name
+        )
+        finder = etree.XPath(f"descendant-or-self::*[{predicate or 'false()'}]")
+        _XPATH_CACHE[key] = finder
+    return finder(root)
+
 
 def mask_values(
     tree: etree._ElementTree | etree._Element,
@@ -30,20 +78,38 @@ def mask_values(
     vault: Vault,
 ) -> etree._ElementTree:
     """Replace numeric text content with UUID placeholders stored in the vault."""
+    from lxml import etree
+
     # Handle both Element (from fromstring) and ElementTree
     if isinstance(tree, etree._Element):
         tree = etree.ElementTree(tree)
 
-    pattern = re.compile(masking_config.value_pattern)
+    pattern = _value_pattern(masking_config)
+    # The default pattern can only match text that _may_be_number accepts,
+    # which lets most non-numeric leaves skip the regex call entirely.
+    prefilter = masking_config.value_pattern == DEFAULT_VALUE_PATTERN
     root = tree.getroot()
 
+    # Collect matches first so the vault can allocate placeholders in one batch.
+    matched: list[etree._Element] = []
+    originals: list[str] = []
     for elem in root.iter():
-        if not isinstance(elem.tag, str):
+        text = elem.text
+        if not text or not isinstance(elem.tag, str):
             continue
-        text = (elem.text or "").strip()
-        if text and pattern.fullmatch(text):
-            placeholder = vault.store(text)
-            elem.text = placeholder
+        # Only allocate a stripped copy when there is whitespace to remove.
+        if text[0].isspace() or text[-1].isspace():
+            text = text.strip()
+            if not text:
+                continue
+        if prefilter and not _may_be_number(text):
+            continue
+        if pattern.fullmatch(text):
+            matched.append(elem)
+            originals.append(text)
+
+    for elem, placeholder in zip(matched, vault.store_batch(originals)):
+        elem.text = placeholder
 
     return tree
 
@@ -51,14 +117,17 @@ def mask_values(
 def shuffle_siblings(
     tree: etree._ElementTree | etree._Element | str,
     shuffling_config: ShufflingConfig,
-    rules: list[Rule] | None = None,
+    rules: list[Rule] | Policy | None = None,
 ) -> str:
     """Shuffle child elements to break positional inference.
 
-    If *rules* are provided, only parent elements matching a shuffle_siblings
-    rule are processed.  Otherwise every element whose tag appears in
-    ``shuffling_config.target_tags`` has its children shuffled.
+    If *rules* are provided (as a rule list or a whole Policy), only parent
+    elements matching a shuffle_siblings rule are processed.  Otherwise every
+    element whose tag appears in ``shuffling_config.target_tags`` has its
+    children shuffled.
     """
+    from lxml import etree
+
     # Handle string input (XML as string)
     if isinstance(tree, str):
         tree = etree.fromstring(tree.encode())
@@ -74,36 +143,42 @@ def shuffle_siblings(
     root = tree.getroot()
 
     # Determine which parent tags should have children shuffled.
-    shuffle_parents: set[str] | None = None
-    if rules:
+    if isinstance(rules, Policy):
+        shuffle_parents: Iterable[str] = rules.shuffle_parent_set
+    elif rules:
         shuffle_parents = {
             r.tag_pattern for r in rules if r.action == "shuffle_siblings"
         }
+    else:
+        shuffle_parents = shuffling_config.target_tags
+
+    if not shuffle_parents:
+        return etree.tostring(tree, encoding='unicode')
 
+    # Walk the live tree rather than a precomputed list of parents.  Nested
+    # parents are then reached in the order earlier shuffles left them (as
+    # lxml's iterator sees it), so a given seed keeps producing the same
+    # output.  A tag-filtered iter() would prefetch different nodes and
+    # change that order.
+    names = frozenset(shuffle_parents)
     for elem in root.iter():
-        tag = etree.QName(elem).localname if isinstance(elem.tag, str) else None
-        if tag is None:
+        tag = elem.tag
+        if not isinstance(tag, str) or _localname(tag) not in names:
             continue
-
-        should_shuffle = False
-        if shuffle_parents is not None:
-            should_shuffle = tag in shuffle_parents
-        else:
-            should_shuffle = tag in shuffling_config.target_tags
-
-        if should_shuffle and len(elem) >= 2:
+        if len(elem) >= 2:
             children = list(elem)
             rng.shuffle(children)
-            for child in list(elem):
-                elem.remove(child)
-            for child in children:
-                elem.append(child)
+            # Slice assignment relinks all children in one pass instead of
+            # an O(n^2) remove/append sequence.
+            elem[:] = children
 
     return etree.tostring(tree, encoding='unicode')
 
 
 def _apply_tag_shadowing(tree: etree._ElementTree | etree._Element | str, tag_map: dict[str, str]) -> etree._ElementTree:
     """Rename tags according to *tag_map*."""
+    from lxml import etree
+
     # Handle string input (XML as string)
     if isinstance(tree, str):
         tree = etree.fromstring(tree.encode())
@@ -111,29 +186,53 @@ def _apply_tag_shadowing(tree: etree._ElementTree | etree._Element | str, tag_ma
     if isinstance(tree, etree._Element):
         tree = etree.ElementTree(tree)
     root = tree.getroot()
-    for elem in root.iter():
-        if not isinstance(elem.tag, str):
-            continue
-        local = etree.QName(elem).localname
-        if local in tag_map:
-            # Preserve namespace if present.
-            ns = etree.QName(elem).namespace
-            if ns:
-                elem.tag = f"{{{ns}}}{tag_map[local]}"
-            else:
-                elem.tag = tag_map[local]
+    for elem in _elements_named(root, tag_map):
+        tag = elem.tag
+        local = _localname(tag)
+        # Keep the "{namespace}" prefix, if any, and swap only the local name.
+        elem.tag = tag[:len(tag) - len(local)] + tag_map[local]
     return tree
 
 
+def _run_pipeline(
+    xml_path: Path,
+    policy: Policy,
+    config: PolicyEngineConfig,
+    tag_map: dict[str, str] | None,
+    vault: Vault,
+) -> etree._ElementTree:
+    """Parse *xml_path* and apply masking, shuffling and tag shadowing."""
+    from lxml import etree
+
+    # Parse XML
+    tree = etree.parse(str(xml_path))  # noqa: S320
+
+    # 1. Mask numeric values
+    if policy.global_masking or policy.mask_rules:
+        tree = mask_values(tree, config.masking, vault)
+
+    # 2. Shuffle siblings
+    if config.shuffling.enabled and policy.shuffle_rules:
+        tree = shuffle_siblings(tree, config.shuffling, policy)
+
+    # 3. Tag shadowing
+    effective_map = tag_map if tag_map is not None else DEFAULT_TAG_MAP
+    return _apply_tag_shadowing(tree, effective_map)
+
+
 def apply_gatekeeper(
     xml_path: str | Path,
     policy: Policy,
     config: PolicyEngineConfig | None = None,
     output_dir: str | Path | None = None,
     tag_map: dict[str, str] | None = None,
+    vault: Vault | None = None,
 ) -> tuple[Path, Path]:
     """Apply a full masking + shuffling pipeline to an XML file.
 
+    Pass a shared *vault* opened with ``with Vault(path) as vault:`` to
+    process many files and write the vault only once at the end.
+
     Returns ``(sanitized_xml_path, vault_path)``.
     """
     from src.config import load_config
@@ -145,31 +244,48 @@ def apply_gatekeeper(
     out_dir = Path(output_dir) if output_dir else xml_path.parent
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    # Parse XML
-    tree = etree.parse(str(xml_path))  # noqa: S320
-
     # Vault for this session
-    vault = Vault(config.vault_path)
-
-    # 1. Mask numeric values
-    mask_rules = [r for r in policy.rules if r.action == "mask_value"]
-    if policy.global_masking or mask_rules:
-        tree = mask_values(tree, config.masking, vault)
+    if vault is None:
+        vault = Vault(config.vault_path)
 
-    # 2. Shuffle siblings
-    shuffle_rules = [r for r in policy.rules if r.action == "shuffle_siblings"]
-    if config.shuffling.enabled and shuffle_rules:
-        tree = shuffle_siblings(tree, config.shuffling, shuffle_rules)
-
-    # 3. Tag shadowing
-    effective_map = tag_map if tag_map is not None else DEFAULT_TAG_MAP
-    tree = _apply_tag_shadowing(tree, effective_map)
+    tree = _run_pipeline(xml_path, policy, config, tag_map, vault)
 
     # Write outputs
     sanitized_path = out_dir / f"{xml_path.stem}_sanitized.xml"
     tree.write(str(sanitized_path), xml_declaration=True, encoding="UTF-8", pretty_print=True)
 
-    vault.save()
-    vault_path = config.vault_path
+    vault_path = vault.save()
 
     return sanitized_path, vault_path
+
+
+def sanitize_xml(
+    xml_path: str | Path,
+    policy: Policy,
+    config: PolicyEngineConfig | None = None,
+    tag_map: dict[str, str] | None = None,
+    vault: Vault | None = None,
+) -> tuple[str, Path]:
+    """Like :func:`apply_gatekeeper`, but return the sanitized XML as text.
+
+    Nothing is written next to the input; only the vault is persisted, so
+    the masked values can still be rehydrated later.
+
+    Returns ``(sanitized_xml_text, vault_path)``.
+    """
+    from lxml import etree
+
+    from src.config import load_config
+
+    if config is None:
+        config = load_config()
+
+    if vault is None:
+        vault = Vault(config.vault_path)
+
+    tree = _run_pipeline(Path(xml_path), policy, config, tag_map, vault)
+    text = etree.tostring(
+        tree, xml_declaration=True, encoding="UTF-8", pretty_print=True
+    ).decode("utf-8")
+
+    return text, vault.save()
@@ -2,14 +2,15 @@
 
 from __future__ import annotations
 
-import json
 import re
+from collections import Counter
 from dataclasses import dataclass, field
+from functools import cached_property
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Literal
 
-from lxml import etree
+from src import _json
 
 
 @dataclass
@@ -23,21 +24,51 @@ class Rule:
 
 @dataclass
 class Policy:
-    """Collection of rules that govern how an XML file is anonymized."""
+    """Collection of rules that govern how an XML file is anonymized.
+
+    The per-action views below are computed on first access; build a new
+    Policy rather than mutating ``rules`` afterwards.
+    """
 
     version: str = "1.0"
     global_masking: bool = False
     rules: list[Rule] = field(default_factory=list)
     created_at: str | None = None
 
+    @cached_property
+    def mask_rules(self) -> list[Rule]:
+        return [r for r in self.rules if r.action == "mask_value"]
+
+    @cached_property
+    def shuffle_rules(self) -> list[Rule]:
+        return [r for r in self.rules if r.action == "shuffle_siblings"]
+
+    @cached_property
+    def shuffle_parent_set(self) -> frozenset[str]:
+        return frozenset(r.tag_pattern for r in self.shuffle_rules)
+
 
 # Tags whose text content should always be masked.
-_SENSITIVE_KEYWORDS = {"pressure", "temperature", "velocity", "coord", "val", "force", "stress"}
+_SENSITIVE_KEYWORDS = ("pressure", "temperature", "velocity", "coord", "val", "force", "stress")
 
 # Numeric-only pattern used to detect values worth masking.
 _NUMERIC_RE = re.compile(r"^-?\d+\.?\d*$")
 
 
+def _may_be_number(text: str) -> bool:
+    """Return False when non-empty *text* cannot start a ``-?\\d`` number.
+
+    A cheap check run before the numeric regexes.  ``\\d`` matches any Unicode
+    decimal digit, so this uses ``isdecimal()`` rather than an ASCII range.
+    """
+    return text[0] == "-" or text[0].isdecimal()
+
+
+def _localname(tag: str) -> str:
+    """Return the local part of a Clark-notation tag without building a QName."""
+    return tag.rpartition("}")[2] if tag[0] == "{" else tag
+
+
 def generate_policy(xml_path: str | Path) -> Policy:
     """Scan an XML file and auto-generate masking / shuffling rules.
 
@@ -45,59 +76,109 @@ def generate_policy(xml_path: str | Path) -> Policy:
     * Tag names containing a sensitive keyword -> mask_value
     * Leaf elements with purely numeric text     -> mask_value
     * Elements with >=2 children of the same tag -> shuffle_siblings
+
+    The file is streamed with ``iterparse`` and each subtree is discarded once
+    inspected, so memory stays proportional to nesting depth and the number
+    of rules, not file size.  Rules come out in document order.
     """
+    from lxml import etree
+
     xml_path = Path(xml_path)
-    tree = etree.parse(str(xml_path))  # noqa: S320
-    root = tree.getroot()
 
     seen_tags: set[str] = set()
-    rules: list[Rule] = []
-
-    for elem in root.iter():
-        tag = etree.QName(elem).localname if isinstance(elem.tag, str) else None
-        if tag is None:
+    # Rules keyed by their element's (document-order index, position within
+    # the element), so they can be emitted in document order at the end.
+    mask_rules: list[tuple[tuple[int, int], Rule]] = []
+    # Shuffle rules are only known once an element closes, which is not
+    # document order; keep the earliest element for each parent/child pair.
+    shuffle_rules: dict[str, tuple[tuple[int, int], Rule]] = {}
+    # One [document-order index, child-tag counter, masked] per open element,
+    # innermost last.  ``masked`` stays None until the element's text is read.
+    open_elems: list[list] = []
+    order = 0
+
+    for event, elem in etree.iterparse(str(xml_path), events=("start", "end")):  # noqa: S320
+        if event == "start":
+            # The parent's text is complete by the time its first child
+            # starts, so the mask check still runs in document order.
+            if open_elems and open_elems[-1][2] is None:
+                parent = elem.getparent()
+                open_elems[-1][2] = _check_mask(
+                    _localname(parent.tag), parent.text, open_elems[-1][0], seen_tags, mask_rules
+                )
+            open_elems.append([order, Counter(), None])
+            order += 1
             continue
 
-        # --- mask_value for sensitive keywords ---
-        tag_lower = tag.lower()
-        if any(kw in tag_lower for kw in _SENSITIVE_KEYWORDS) and tag not in seen_tags:
-            rules.append(Rule(tag_pattern=tag, action="mask_value"))
-            seen_tags.add(tag)
-            continue
-
-        # --- mask_value for numeric leaf text ---
-        text = (elem.text or "").strip()
-        if text and _NUMERIC_RE.match(text) and tag not in seen_tags:
-            rules.append(Rule(tag_pattern=tag, action="mask_value"))
-            seen_tags.add(tag)
-            continue
+        index, child_tags, masked = open_elems.pop()
+        tag = _localname(elem.tag)
+        if open_elems:
+            open_elems[-1][1][tag] += 1
+        if masked is None:
+            masked = _check_mask(tag, elem.text, index, seen_tags, mask_rules)
 
         # --- shuffle_siblings for repeated children ---
-        child_tags: dict[str, int] = {}
-        for child in elem:
-            ctag = etree.QName(child).localname if isinstance(child.tag, str) else None
-            if ctag:
-                child_tags[ctag] = child_tags.get(ctag, 0) + 1
-        for ctag, count in child_tags.items():
-            shuffle_key = f"{tag}/{ctag}"
-            if count >= 2 and shuffle_key not in seen_tags:
-                rules.append(
-                    Rule(
-                        tag_pattern=tag,
-                        action="shuffle_siblings",
-                        parameters={"child_tag": ctag},
+        if not masked:
+            for position, (ctag, count) in enumerate(child_tags.items(), 1):
+                if count < 2:
+                    continue
+                shuffle_key = f"{tag}/{ctag}"
+                key = (index, position)
+                found = shuffle_rules.get(shuffle_key)
+                if found is None or key < found[0]:
+                    shuffle_rules[shuffle_key] = (
+                        key,
+                        Rule(
+                            tag_pattern=tag,
+                            action="shuffle_siblings",
+                            parameters={"child_tag": ctag},
+                        ),
                     )
-                )
-                seen_tags.add(shuffle_key)
+
+        # Drop the finished subtree and any already-inspected siblings.
+        elem.clear(keep_tail=True)
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+
+    found_rules = mask_rules + list(shuffle_rules.values())
+    found_rules.sort(key=lambda item: item[0])
 
     return Policy(
         version="1.0",
         global_masking=False,
-        rules=rules,
+        rules=[rule for _, rule in found_rules],
         created_at=datetime.now(timezone.utc).isoformat(),
     )
 
 
+def _check_mask(
+    tag: str,
+    raw_text: str | None,
+    index: int,
+    seen_tags: set[str],
+    mask_rules: list[tuple[tuple[int, int], Rule]],
+) -> bool:
+    """Record a mask_value rule if this element triggers one; return whether it did."""
+    if tag in seen_tags:
+        return False
+
+    # --- mask_value for sensitive keywords ---
+    tag_lower = tag.lower()
+    if not any(kw in tag_lower for kw in _SENSITIVE_KEYWORDS):
+        # --- mask_value for numeric leaf text ---
+        text = raw_text or ""
+        if text and (text[0].isspace() or text[-1].isspace()):
+            text = text.strip()
+        if not (text and _may_be_number(text) and _NUMERIC_RE.match(text)):
+            return False
+
+    mask_rules.append(((index, 0), Rule(tag_pattern=tag, action="mask_value")))
+    seen_tags.add(tag)
+    return True
+
+
 # ---------------------------------------------------------------------------
 # Serialization helpers
 # ---------------------------------------------------------------------------
@@ -126,14 +207,14 @@ def save_policy(policy: Policy, path: str | Path) -> Path:
         "rules": [_rule_to_dict(r) for r in policy.rules],
         "created_at": policy.created_at,
     }
-    path.write_text(json.dumps(data, indent=2))
+    path.write_bytes(_json.dumps(data, indent=True))
     return path
 
 
 def load_policy(path: str | Path) -> Policy:
     """Read a Policy from a JSON file."""
     path = Path(path)
-    data = json.loads(path.read_text())
+    data = _json.loads(path.read_bytes())
     return Policy(
         version=data.get("version", "1.0"),
         global_masking=data.get("global_masking", False),
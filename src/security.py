@@ -13,6 +13,7 @@ import logging
 import os
 import socket
 import subprocess
+import time
 from pathlib import Path
 
 logger = logging.getLogger("molt-shield.security")
@@ -22,6 +23,31 @@ logger = logging.getLogger("molt-shield.security")
 # Network isolation
 # ---------------------------------------------------------------------------
 
+# Outbound probe result as (checked_at, reachable); reused for _NET_CHECK_TTL
+# seconds so repeated status requests don't each stall on a connect timeout.
+_NET_CHECK_CACHE: tuple[float, bool] | None = None
+_NET_CHECK_TTL = 60.0
+
+
+def _probe_outbound() -> bool:
+    """Return True if an external host (8.8.8.8:53) is reachable."""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.settimeout(0.5)
+            sock.connect(("8.8.8.8", 53))
+        return True
+    except (OSError, socket.timeout):
+        return False  # Expected — no outbound connectivity
+
+
+def _outbound_reachable() -> bool:
+    """Return the cached outbound probe result, re-probing after the TTL."""
+    global _NET_CHECK_CACHE
+    now = time.monotonic()
+    if _NET_CHECK_CACHE is None or now - _NET_CHECK_CACHE[0] > _NET_CHECK_TTL:
+        _NET_CHECK_CACHE = (now, _probe_outbound())
+    return _NET_CHECK_CACHE[1]
+
 
 def verify_network_isolation() -> list[str]:
     """Verify that the server environment enforces network isolation.
@@ -52,17 +78,11 @@ def verify_network_isolation() -> list[str]:
             )
 
     # Best-effort check: try to detect if we can reach an external host
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(2)
-        sock.connect(("8.8.8.8", 53))
-        sock.close()
+    if _outbound_reachable():
         issues.append(
             "Outbound network connectivity detected (could reach 8.8.8.8:53). "
             "Container should have no external network access."
         )
-    except (OSError, socket.timeout):
-        pass  # Expected — no outbound connectivity
 
     return issues
 
@@ -72,30 +92,33 @@ def verify_network_isolation() -> list[str]:
 # ---------------------------------------------------------------------------
 
 
-def _is_readonly(path: Path) -> bool:
-    """Check if a path is read-only by attempting a write test."""
-    if not path.exists():
-        return False
-    try:
-        test_file = path / ".molt_write_test"
-        test_file.write_text("test")
-        test_file.unlink()
-        return False  # Writable — not read-only
-    except (PermissionError, OSError):
-        return True
-
-
-def _is_writable(path: Path) -> bool:
-    """Check if a path is writable."""
-    if not path.exists():
-        return False
-    try:
-        test_file = path / ".molt_write_test"
-        test_file.write_text("test")
-        test_file.unlink()
-        return True
-    except (PermissionError, OSError):
-        return False
+# Writability of existing directories as (checked_at, writable), keyed by
+# resolved path and re-probed after _WRITABLE_TTL seconds so a remount is
+# noticed.  Missing paths are not cached so a directory mounted after startup
+# is picked up.
+_WRITABLE_CACHE: dict[str, tuple[float, bool]] = {}
+_WRITABLE_TTL = _NET_CHECK_TTL
+
+# Check against the effective UID/GID, as a real write would, where supported.
+_ACCESS_EFFECTIVE_IDS = os.access in os.supports_effective_ids
+
+
+def _probe_dir(path: Path) -> tuple[bool, bool]:
+    """Return ``(exists, writable)`` for *path* without creating a test file."""
+    resolved = str(path.resolve())
+    now = time.monotonic()
+    cached = _WRITABLE_CACHE.get(resolved)
+    if cached is None or now - cached[0] > _WRITABLE_TTL:
+        if not os.path.exists(resolved):
+            _WRITABLE_CACHE.pop(resolved, None)
+            return False, False
+        # Creating a file needs write and search permission on the directory;
+        # access() also reports EROFS for read-only mounts.
+        writable = os.access(
+            resolved, os.W_OK | os.X_OK, effective_ids=_ACCESS_EFFECTIVE_IDS
+        )
+        cached = _WRITABLE_CACHE[resolved] = (now, writable)
+    return True, cached[1]
 
 
 def verify_filesystem_permissions() -> list[str]:
@@ -116,8 +139,9 @@ def verify_filesystem_permissions() -> list[str]:
     vault_dir = Path(os.environ.get("MOLT_VAULT_DIR", "./vault"))
 
     # Check input directory is read-only
-    if input_dir.exists():
-        if not _is_readonly(input_dir):
+    exists, writable = _probe_dir(input_dir)
+    if exists:
+        if writable:
             issues.append(
                 f"Input directory '{input_dir}' is writable. "
                 "It should be mounted read-only."
@@ -126,8 +150,9 @@ def verify_filesystem_permissions() -> list[str]:
         issues.append(f"Input directory '{input_dir}' does not exist.")
 
     # Check output directory is writable
-    if output_dir.exists():
-        if not _is_writable(output_dir):
+    exists, writable = _probe_dir(output_dir)
+    if exists:
+        if not writable:
             issues.append(
                 f"Output directory '{output_dir}' is not writable. "
                 "It must be writable for sanitized output."
@@ -136,8 +161,9 @@ def verify_filesystem_permissions() -> list[str]:
         issues.append(f"Output directory '{output_dir}' does not exist.")
 
     # Check vault directory is writable
-    if vault_dir.exists():
-        if not _is_writable(vault_dir):
+    exists, writable = _probe_dir(vault_dir)
+    if exists:
+        if not writable:
             issues.append(
                 f"Vault directory '{vault_dir}' is not writable. "
                 "It must be writable for session vaults."
@@ -148,7 +174,7 @@ def verify_filesystem_permissions() -> list[str]:
     # Check that src/ is not writable in strict mode
     if os.environ.get("MOLT_STRICT", "false").lower() == "true":
         src_dir = Path(__file__).parent
-        if not _is_readonly(src_dir):
+        if _probe_dir(src_dir)[1]:
             issues.append(
                 f"Source directory '{src_dir}' is writable in strict mode. "
                 "Application code should be mounted read-only."
@@ -162,6 +188,81 @@ def verify_filesystem_permissions() -> list[str]:
 # ---------------------------------------------------------------------------
 
 
+# Bit positions from linux/capability.h.
+_DANGEROUS_CAP_BITS = {
+    1: "cap_dac_override",
+    12: "cap_net_admin",
+    19: "cap_sys_ptrace",
+    21: "cap_sys_admin",
+}
+
+
+def _status_field(status: bytes, name: bytes) -> bytes | None:
+    """Return the value of the ``name:`` line in /proc/self/status content.
+
+    *status* must start with a newline so every field, including the first,
+    can be located with a single ``find``.
+    """
+    key = b"\n" + name + b":"
+    start = status.find(key)
+    if start < 0:
+        return None
+    start += len(key)
+    end = status.find(b"\n", start)
+    return status[start:end if end >= 0 else None].strip()
+
+
+def _capability_issues(status: bytes) -> list[str] | None:
+    """Report dangerous bits set in the CapEff mask of /proc/self/status content.
+
+    *status* follows the :func:`_status_field` convention.  Returns ``None``
+    when there is no parseable CapEff line, so the caller can fall back to
+    capsh.
+    """
+    cap_eff = _status_field(status, b"CapEff")
+    if cap_eff is None:
+        return None
+    try:
+        mask = int(cap_eff, 16)
+    except ValueError:
+        return None
+    return [
+        f"Dangerous capability detected: {cap}. "
+        "Container should drop all unnecessary capabilities."
+        for bit, cap in _DANGEROUS_CAP_BITS.items()
+        if mask & (1 << bit)
+    ]
+
+
+def _check_capabilities_via_capsh() -> list[str]:
+    """Fallback capability check for systems without CapEff in /proc."""
+    issues: list[str] = []
+    capsh_path = Path("/usr/sbin/capsh")
+    if not capsh_path.exists():
+        return issues
+    try:
+        result = subprocess.run(
+            [str(capsh_path), "--print"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        current_line = ""
+        for line in result.stdout.splitlines():
+            if line.startswith("Current:"):
+                current_line = line.lower()
+                break
+        for cap in _DANGEROUS_CAP_BITS.values():
+            if cap in current_line:
+                issues.append(
+                    f"Dangerous capability detected: {cap}. "
+                    "Container should drop all unnecessary capabilities."
+                )
+    except (subprocess.TimeoutExpired, OSError):
+        logger.debug("Could not check capabilities via capsh")
+    return issues
+
+
 def verify_process_security() -> list[str]:
     """Verify process-level security constraints.
 
@@ -183,53 +284,29 @@ def verify_process_security() -> list[str]:
         )
 
     # Check no-new-privileges (Linux-specific)
-    status_path = Path("/proc/self/status")
-    if status_path.exists():
-        try:
-            status_content = status_path.read_text()
-            for line in status_content.splitlines():
-                if line.startswith("NoNewPrivs:"):
-                    value = line.split(":")[1].strip()
-                    if value != "1":
-                        issues.append(
-                            "NoNewPrivs is not set. "
-                            "Container should use 'no-new-privileges:true'."
-                        )
-                    break
-            else:
-                logger.debug("NoNewPrivs field not found in /proc/self/status")
-        except OSError:
-            logger.debug("Could not read /proc/self/status")
+    status: bytes | None = None
+    try:
+        status = b"\n" + Path("/proc/self/status").read_bytes()
+    except FileNotFoundError:
+        pass
+    except OSError:
+        logger.debug("Could not read /proc/self/status")
+
+    if status is not None:
+        no_new_privs = _status_field(status, b"NoNewPrivs")
+        if no_new_privs is None:
+            logger.debug("NoNewPrivs field not found in /proc/self/status")
+        elif no_new_privs != b"1":
+            issues.append(
+                "NoNewPrivs is not set. "
+                "Container should use 'no-new-privileges:true'."
+            )
 
     # Check for dangerous capabilities (Linux-specific)
-    capsh_path = Path("/usr/sbin/capsh")
-    if capsh_path.exists():
-        try:
-            result = subprocess.run(
-                [str(capsh_path), "--print"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            dangerous_caps = {
-                "cap_sys_admin",
-                "cap_net_admin",
-                "cap_sys_ptrace",
-                "cap_dac_override",
-            }
-            current_line = ""
-            for line in result.stdout.splitlines():
-                if line.startswith("Current:"):
-                    current_line = line.lower()
-                    break
-            for cap in dangerous_caps:
-                if cap in current_line:
-                    issues.append(
-                        f"Dangerous capability detected: {cap}. "
-                        "Container should drop all unnecessary capabilities."
-                    )
-        except (subprocess.TimeoutExpired, OSError):
-            logger.debug("Could not check capabilities via capsh")
+    cap_issues = _capability_issues(status) if status is not None else None
+    if cap_issues is None:
+        cap_issues = _check_capabilities_via_capsh()
+    issues.extend(cap_issues)
 
     # Check for proxy env vars (also a process-level concern)
     proxy_vars = ["HTTP_PROXY", "HTTPS_PROXY", "http_proxy", "https_proxy"]
@@ -7,17 +7,25 @@ listing policies, and querying vault status via the Model Context Protocol.
 """
 
 import asyncio
+import functools
 import json
 import logging
 import os
 import sys
+from collections.abc import Awaitable, Callable
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
 
+from . import _json
+
+if TYPE_CHECKING:
+    from .config import PolicyEngineConfig
+    from .policy_engine import Policy
+
 logger = logging.getLogger("molt-shield")
 
 # ---------------------------------------------------------------------------
@@ -38,111 +46,218 @@ HOST = os.environ.get("MOLT_HOST", "127.0.0.1")
 PORT = int(os.environ.get("MOLT_PORT", "3000"))
 STRICT_MODE = os.environ.get("MOLT_STRICT", "false").lower() == "true"
 
+# ---------------------------------------------------------------------------
+# Parsed-file caches
+# ---------------------------------------------------------------------------
+
+_T = TypeVar("_T")
+
+# path -> (st_mtime_ns, st_size, parsed value).  A rewritten file changes the
+# stat key, so a stale entry is simply replaced on the next lookup.
+_POLICY_CACHE: dict[Path, tuple[int, int, Any]] = {}
+_POLICY_JSON_CACHE: dict[Path, tuple[int, int, Any]] = {}
+
+
+def _load_cached(
+    path: Path,
+    cache: dict[Path, tuple[int, int, Any]],
+    loader: Callable[[Path], _T],
+    st: os.stat_result | None = None,
+) -> _T:
+    """Return ``loader(path)``, reusing the previous result while the file is unchanged.
+
+    Pass *st* when the caller already has the file's stat (e.g. from scandir).
+    """
+    if st is None:
+        st = path.stat()
+    hit = cache.get(path)
+    if hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        return hit[2]
+    value = loader(path)
+    cache[path] = (st.st_mtime_ns, st.st_size, value)
+    return value
+
+
+def _read_json(path: Path) -> Any:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _scan_dir(directory: Path, suffix: str) -> list[os.DirEntry[str]]:
+    """Return regular files in *directory* ending with *suffix*, sorted by name."""
+    with os.scandir(directory) as it:
+        entries = [e for e in it if e.name.endswith(suffix) and e.is_file()]
+    entries.sort(key=lambda e: e.name)
+    return entries
+
+
 # ---------------------------------------------------------------------------
 # Path security helpers
 # ---------------------------------------------------------------------------
 
 
-def _resolve_input_path(filepath: str) -> Path:
-    """Resolve and validate an input file path within the allowed input directory."""
-    path = Path(filepath)
+@functools.cache
+def _resolved_root(directory: Path) -> Path:
+    """Return *directory* resolved, running realpath() once per configured directory.
+
+    Resolved on first use rather than at import, so the root follows the
+    directory actually configured when a request arrives.
+    """
+    return directory.resolve()
+
+
+def _resolve_within(path: Path, root: Path, original: str, label: str) -> Path:
+    """Resolve *path* (relative paths against *root*) and ensure it stays inside *root*."""
     if not path.is_absolute():
-        path = DATA_INPUT_DIR / path
+        path = root / path
 
     resolved = path.resolve()
-    input_resolved = DATA_INPUT_DIR.resolve()
 
-    if not str(resolved).startswith(str(input_resolved)):
+    # Compare path components, not string prefixes: "/data/input_evil" must
+    # not pass as being inside "/data/input".
+    if not resolved.is_relative_to(root):
         raise ValueError(
-            f"Access denied: path '{filepath}' is outside the input directory"
+            f"Access denied: path '{original}' is outside the {label} directory"
         )
+    return resolved
+
+
+def _resolve_input_path(filepath: str) -> Path:
+    """Resolve and validate an input file path within the allowed input directory."""
+    resolved = _resolve_within(
+        Path(filepath), _resolved_root(DATA_INPUT_DIR), filepath, "input"
+    )
     if not resolved.exists():
         raise ValueError(f"File not found: {filepath}")
     return resolved
 
 
+def _resolve_policy_file(policy_path_str: str) -> Path:
+    """Resolve and validate a policy file path within the policy directory."""
+    policy_file = _resolve_within(
+        Path(policy_path_str), _resolved_root(POLICY_DIR), policy_path_str, "policy"
+    )
+    if not policy_file.exists():
+        raise RuntimeError(
+            f"No active policy found at {policy_file}. "
+            "Run the screener first: python -m src.cli scan <input.xml>"
+        )
+    return policy_file
+
+
 # ---------------------------------------------------------------------------
 # Tool definitions
 # ---------------------------------------------------------------------------
 
 
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available MCP tools."""
-    return [
-        Tool(
-            name="read_safe_structure",
-            description=(
-                "Read and sanitize an XML file for AI analysis. "
-                "Applies masking, shuffling, and tag shadowing per the active policy. "
-                "Returns the sanitized XML content with all proprietary values replaced."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "filepath": {
-                        "type": "string",
-                        "description": (
-                            "Path to the XML file "
-                            "(relative to input directory or absolute)"
-                        ),
-                    },
-                    "policy": {
-                        "type": "string",
-                        "description": "Path to policy file (default: policy_locked.json)",
-                        "default": "policy_locked.json",
-                    },
-                },
-                "required": ["filepath"],
-            },
+# Tool descriptors are static, so build them once rather than per listTools.
+_TOOLS: list[Tool] = [
+    Tool(
+        name="read_safe_structure",
+        description=(
+            "Read and sanitize an XML file for AI analysis. "
+            "Applies masking, shuffling, and tag shadowing per the active policy. "
+            "Returns the sanitized XML content with all proprietary values replaced."
         ),
-        Tool(
-            name="submit_optimization",
-            description=(
-                "Submit optimization suggestions from AI analysis. "
-                "The suggestions reference masked/anonymized values which will be "
-                "rehydrated using the session vault before applying."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "session_id": {
-                        "type": "string",
-                        "description": "Session identifier from the read operation",
-                    },
-                    "proposed_changes": {
-                        "type": "object",
-                        "description": "Dictionary of proposed parameter changes (masked keys/values)",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "filepath": {
+                    "type": "string",
+                    "description": (
+                        "Path to the XML file "
+                        "(relative to input directory or absolute)"
+                    ),
+                },
+                "policy": {
+                    "type": "string",
+                    "description": "Path to policy file (default: policy_locked.json)",
+                    "default": "policy_locked.json",
                 },
-                "required": ["session_id", "proposed_changes"],
             },
+            "required": ["filepath"],
+        },
+    ),
+    Tool(
+        name="batch_read_safe_structure",
+        description=(
+            "Sanitize several XML files in one call. "
+            "Files are processed in parallel with the same policy and session vault; "
+            "returns one sanitized XML document per file, in request order."
         ),
-        Tool(
-            name="list_policies",
-            description="List all available policy files and their status.",
-            inputSchema={
-                "type": "object",
-                "properties": {},
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "filepaths": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": (
+                        "Paths to the XML files "
+                        "(relative to input directory or absolute)"
+                    ),
+                },
+                "policy": {
+                    "type": "string",
+                    "description": "Path to policy file (default: policy_locked.json)",
+                    "default": "policy_locked.json",
+                },
             },
+            "required": ["filepaths"],
+        },
+    ),
+    Tool(
+        name="submit_optimization",
+        description=(
+            "Submit optimization suggestions from AI analysis. "
+            "The suggestions reference masked/anonymized values which will be "
+            "rehydrated using the session vault before applying."
         ),
-        Tool(
-            name="get_vault_info",
-            description=(
-                "Show vault status including active sessions, entry counts, "
-                "and storage location. Does NOT reveal original values."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "session_id": {
-                        "type": "string",
-                        "description": "Optional session ID to inspect a specific vault",
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "session_id": {
+                    "type": "string",
+                    "description": "Session identifier from the read operation",
+                },
+                "proposed_changes": {
+                    "type": "object",
+                    "description": "Dictionary of proposed parameter changes (masked keys/values)",
                 },
             },
+            "required": ["session_id", "proposed_changes"],
+        },
+    ),
+    Tool(
+        name="list_policies",
+        description="List all available policy files and their status.",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+        },
+    ),
+    Tool(
+        name="get_vault_info",
+        description=(
+            "Show vault status including active sessions, entry counts, "
+            "and storage location. Does NOT reveal original values."
         ),
-    ]
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "session_id": {
+                    "type": "string",
+                    "description": "Optional session ID to inspect a specific vault",
+                }
+            },
+        },
+    ),
+]
+
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available MCP tools."""
+    return list(_TOOLS)
 
 
 # ---------------------------------------------------------------------------
@@ -153,13 +268,7 @@ async def list_tools() -> list[Tool]:
 @app.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     """Dispatch tool calls to the appropriate handler."""
-    handlers = {
-        "read_safe_structure": _handle_read_safe_structure,
-        "submit_optimization": _handle_submit_optimization,
-        "list_policies": _handle_list_policies,
-        "get_vault_info": _handle_get_vault_info,
-    }
-    handler = handlers.get(name)
+    handler = _TOOL_HANDLERS.get(name)
     if handler is None:
         raise ValueError(f"Unknown tool: {name}")
     return await handler(arguments)
@@ -182,37 +291,83 @@ async def _handle_read_safe_structure(
 
     input_path = _resolve_input_path(filepath)
 
-    policy_file = Path(policy_path_str)
-    if not policy_file.is_absolute():
-        policy_file = POLICY_DIR / policy_file
-    if not policy_file.exists():
-        raise RuntimeError(
-            f"No active policy found at {policy_file}. "
-            "Run the screener first: python -m src.cli scan <input.xml>"
-        )
+    policy_file = _resolve_policy_file(policy_path_str)
 
     # Lazy-import to avoid circular imports and allow independent testing
-    from .gatekeeper import apply_gatekeeper
+    from .gatekeeper import sanitize_xml
     from .policy_engine import load_policy
     from .config import load_config
 
-    policy = load_policy(policy_file)
+    policy = _load_cached(policy_file, _POLICY_CACHE, load_policy)
     config = load_config()
 
-    sanitized_path, vault_path = await asyncio.to_thread(
-        apply_gatekeeper, input_path, policy, config
+    # Sanitize in memory in a worker thread so large files never block the
+    # event loop; only the vault touches disk.
+    sanitized_content, vault_path = await asyncio.to_thread(
+        sanitize_xml, input_path, policy, config
     )
 
-    sanitized_content = sanitized_path.read_text(encoding="utf-8")
+    logger.info("Sanitized %s (vault: %s)", input_path.name, vault_path.name)
+
+    return [TextContent(type="text", text=sanitized_content)]
+
+
+def _sanitize_batch(
+    input_paths: list[Path], policy: "Policy", config: "PolicyEngineConfig"
+) -> tuple[list[str], Path]:
+    """Sanitize *input_paths* in parallel threads sharing one vault.
+
+    The vault is written once, after every file is done, so parallel files
+    don't overwrite each other's mappings.  Returns the sanitized texts in
+    input order and the vault path.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .gatekeeper import sanitize_xml
+    from .vault import Vault
+
+    with Vault(config.vault_path) as vault, ThreadPoolExecutor() as pool:
+        results = list(pool.map(
+            lambda path: sanitize_xml(path, policy, config, vault=vault),
+            input_paths,
+        ))
+    return [text for text, _ in results], vault.path
+
+
+async def _handle_batch_read_safe_structure(
+    arguments: dict[str, Any],
+) -> list[TextContent]:
+    """Sanitize several XML files in parallel; returns one text item per file, in order."""
+    filepaths = arguments.get("filepaths")
+    policy_path_str = arguments.get("policy", "policy_locked.json")
+
+    if not filepaths:
+        raise ValueError("Missing required argument: filepaths")
+    if not isinstance(filepaths, list) or not all(isinstance(fp, str) for fp in filepaths):
+        raise ValueError("Argument filepaths must be a list of strings")
+
+    # Validate every path before doing any work.
+    input_paths = [_resolve_input_path(fp) for fp in filepaths]
+    policy_file = _resolve_policy_file(policy_path_str)
+
+    from .policy_engine import load_policy
+    from .config import load_config
+
+    policy = _load_cached(policy_file, _POLICY_CACHE, load_policy)
+    config = load_config()
+
+    # Sanitizing and the final vault write both run off the event loop.
+    contents, vault_path = await asyncio.to_thread(
+        _sanitize_batch, input_paths, policy, config
+    )
 
     logger.info(
-        "Sanitized %s -> %s (vault: %s)",
-        input_path.name,
-        sanitized_path.name,
+        "Sanitized %d files in batch (vault: %s)",
+        len(input_paths),
         vault_path.name,
     )
 
-    return [TextContent(type="text", text=sanitized_content)]
+    return [TextContent(type="text", text=content) for content in contents]
 
 
 async def _handle_submit_optimization(
@@ -228,15 +383,23 @@ async def _handle_submit_optimization(
         raise ValueError("Missing required argument: proposed_changes")
 
     # Persist the proposed changes to the output directory
-    DATA_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    output_path = DATA_OUTPUT_DIR / f"{session_id}_optimization.json"
+    output_root = _resolved_root(DATA_OUTPUT_DIR)
+    output_path = _resolve_within(
+        Path(f"{session_id}_optimization.json"), output_root, session_id, "output"
+    )
 
     payload = {
         "session_id": session_id,
         "proposed_changes": proposed_changes,
     }
-    with open(output_path, "w") as f:
-        json.dump(payload, f, indent=2)
+
+    def _write() -> None:
+        output_root.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(_json.dumps(payload, indent=True))
+
+    # Serialize and write off the event loop; large payloads would otherwise
+    # stall the stdio transport.
+    await asyncio.to_thread(_write)
 
     result = {
         "status": "pending",
@@ -253,14 +416,33 @@ async def _handle_submit_optimization(
         output_path,
     )
 
-    return [TextContent(type="text", text=json.dumps(result, indent=2))]
+    return [TextContent(type="text", text=_json.dumps(result).decode())]
+
+
+def _policy_summary(entry: os.DirEntry[str]) -> dict[str, Any]:
+    path = Path(entry.path)
+    try:
+        data = _load_cached(path, _POLICY_JSON_CACHE, _read_json, entry.stat())
+        return {
+            "name": entry.name,
+            "path": entry.path,
+            "version": data.get("version", "unknown"),
+            "rules_count": len(data.get("rules", [])),
+            "active": entry.name == "policy_locked.json",
+        }
+    except (json.JSONDecodeError, OSError) as exc:
+        return {
+            "name": entry.name,
+            "path": entry.path,
+            "error": str(exc),
+        }
 
 
 async def _handle_list_policies(
     arguments: dict[str, Any],
 ) -> list[TextContent]:
     """List available policy files and their metadata."""
-    policy_dir = POLICY_DIR.resolve()
+    policy_dir = _resolved_root(POLICY_DIR)
     if not policy_dir.exists():
         return [
             TextContent(
@@ -269,24 +451,10 @@ async def _handle_list_policies(
             )
         ]
 
-    policies: list[dict[str, Any]] = []
-    for p in sorted(policy_dir.glob("*.json")):
-        try:
-            with open(p) as f:
-                data = json.load(f)
-            policies.append({
-                "name": p.name,
-                "path": str(p),
-                "version": data.get("version", "unknown"),
-                "rules_count": len(data.get("rules", [])),
-                "active": p.name == "policy_locked.json",
-            })
-        except (json.JSONDecodeError, OSError) as exc:
-            policies.append({
-                "name": p.name,
-                "path": str(p),
-                "error": str(exc),
-            })
+    entries = await asyncio.to_thread(_scan_dir, policy_dir, ".json")
+    policies: list[dict[str, Any]] = list(
+        await asyncio.gather(*(asyncio.to_thread(_policy_summary, e) for e in entries))
+    )
 
     if not policies:
         return [
@@ -296,7 +464,23 @@ async def _handle_list_policies(
             )
         ]
 
-    return [TextContent(type="text", text=json.dumps(policies, indent=2))]
+    return [TextContent(type="text", text=_json.dumps(policies).decode())]
+
+
+def _vault_entry_count(path: Path) -> int:
+    data = _read_json(path)
+    return len(data) if isinstance(data, dict) else 0
+
+
+def _vault_summary(entry: os.DirEntry[str]) -> dict[str, Any]:
+    try:
+        return {
+            "name": entry.name.removesuffix(".vault.json"),
+            "entry_count": _vault_entry_count(Path(entry.path)),
+            "size_bytes": entry.stat().st_size,
+        }
+    except (json.JSONDecodeError, OSError):
+        return {"name": entry.name.removesuffix(".json"), "error": "unreadable"}
 
 
 async def _handle_get_vault_info(
@@ -305,43 +489,37 @@ async def _handle_get_vault_info(
     """Return vault metadata without exposing original values."""
     session_id = arguments.get("session_id")
 
-    vault_dir = VAULT_DIR.resolve()
+    vault_dir = _resolved_root(VAULT_DIR)
     if not vault_dir.exists():
         return [TextContent(type="text", text="Vault directory does not exist.")]
 
     # Single-session query
     if session_id:
-        vault_path = vault_dir / f"{session_id}.vault.json"
-        if not vault_path.exists():
+        vault_path = _resolve_within(
+            Path(f"{session_id}.vault.json"), vault_dir, session_id, "vault"
+        )
+        try:
+            size_bytes = vault_path.stat().st_size
+        except FileNotFoundError:
             return [
                 TextContent(
                     type="text",
                     text=f"No vault found for session '{session_id}'.",
                 )
             ]
-        with open(vault_path) as f:
-            data = json.load(f)
         info = {
             "session_id": session_id,
-            "entry_count": len(data) if isinstance(data, dict) else 0,
+            "entry_count": await asyncio.to_thread(_vault_entry_count, vault_path),
             "vault_path": str(vault_path),
-            "size_bytes": vault_path.stat().st_size,
+            "size_bytes": size_bytes,
         }
-        return [TextContent(type="text", text=json.dumps(info, indent=2))]
+        return [TextContent(type="text", text=_json.dumps(info).decode())]
 
     # List all vault sessions
-    vaults: list[dict[str, Any]] = []
-    for vf in sorted(vault_dir.glob("*.vault.json")):
-        try:
-            with open(vf) as f:
-                data = json.load(f)
-            vaults.append({
-                "name": vf.stem.replace(".vault", ""),
-                "entry_count": len(data) if isinstance(data, dict) else 0,
-                "size_bytes": vf.stat().st_size,
-            })
-        except (json.JSONDecodeError, OSError):
-            vaults.append({"name": vf.stem, "error": "unreadable"})
+    entries = await asyncio.to_thread(_scan_dir, vault_dir, ".vault.json")
+    vaults: list[dict[str, Any]] = list(
+        await asyncio.gather(*(asyncio.to_thread(_vault_summary, e) for e in entries))
+    )
 
     info = {
         "vault_directory": str(vault_dir),
@@ -349,7 +527,17 @@ async def _handle_get_vault_info(
         "sessions": vaults,
     }
 
-    return [TextContent(type="text", text=json.dumps(info, indent=2))]
+    return [TextContent(type="text", text=_json.dumps(info).decode())]
+
+
+# Name -> handler table used by call_tool; built once at import.
+_TOOL_HANDLERS: dict[str, Callable[[dict[str, Any]], Awaitable[list[TextContent]]]] = {
+    "read_safe_structure": _handle_read_safe_structure,
+    "batch_read_safe_structure": _handle_batch_read_safe_structure,
+    "submit_optimization": _handle_submit_optimization,
+    "list_policies": _handle_list_policies,
+    "get_vault_info": _handle_get_vault_info,
+}
 
 
 # ---------------------------------------------------------------------------
@@ -2,21 +2,68 @@
 
 from __future__ import annotations
 
-import json
 import re
-import uuid
-from dataclasses import asdict, dataclass
-from datetime import datetime, timezone
+import secrets
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from src import _json
 
-@dataclass
+_DEFAULT_FORMAT = "VAL_{uuid}"
+
+# Placeholder tokens produced by the default "VAL_{uuid}" format.
+_PLACEHOLDER_RE = re.compile(r"VAL_[a-zA-Z0-9]+")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _format_timestamp(ns: int) -> str:
+    """Render nanoseconds since the epoch as an ISO-8601 UTC string."""
+    return (_EPOCH + timedelta(microseconds=ns // 1000)).isoformat()
+
+
+def _parse_timestamp(value: str) -> int | str:
+    """Inverse of :func:`_format_timestamp` (microsecond precision).
+
+    Naive timestamps are taken as UTC.  Values that are not ISO-8601 are
+    returned unchanged so older vault files still load.
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return value
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - _EPOCH) // timedelta(microseconds=1) * 1000
+
+
+@dataclass(slots=True)
 class VaultEntry:
-    """Single mapping between a masked placeholder and the original value."""
+    """Original value behind a masked placeholder (the placeholder is the dict key).
+
+    ``created_at`` is nanoseconds since the epoch; it is written to disk as
+    an ISO-8601 string.  Entries loaded from a file whose timestamp could not
+    be parsed keep the raw string.
+    """
 
-    masked_value: str
     original_value: str
-    created_at: str
+    created_at: int | str
+
+
+def _entry_to_json(obj: object) -> dict[str, str]:
+    """``default`` hook letting the JSON encoders serialize VaultEntry directly."""
+    if isinstance(obj, VaultEntry):
+        return {
+            "original_value": obj.original_value,
+            "created_at": (
+                _format_timestamp(obj.created_at)
+                if isinstance(obj.created_at, int)
+                else obj.created_at
+            ),
+        }
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 class Vault:
@@ -28,25 +75,52 @@ class Vault:
     def __init__(self, path: str | Path) -> None:
         self.path = Path(path)
         self.entries: dict[str, VaultEntry] = {}
+        self._deferred = False
+
+    def __enter__(self) -> Vault:
+        """Defer :meth:`save` calls until the block exits, then write once."""
+        self._deferred = True
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._deferred = False
+        self.save()
 
     # ------------------------------------------------------------------
     # Core operations
     # ------------------------------------------------------------------
 
-    def store(self, original: str, format_str: str = "VAL_{uuid}") -> str:
+    def store(self, original: str, format_str: str = _DEFAULT_FORMAT) -> str:
         """Create a masked placeholder for *original* and store the mapping.
 
         Returns the placeholder string.
         """
-        uid = uuid.uuid4().hex[:12]
-        masked = format_str.format(uuid=uid)
+        # 48 random bits rendered as 12 hex characters.
+        uid = secrets.token_hex(6)
+        masked = "VAL_" + uid if format_str == _DEFAULT_FORMAT else format_str.format(uuid=uid)
         self.entries[masked] = VaultEntry(
-            masked_value=masked,
             original_value=original,
-            created_at=datetime.now(timezone.utc).isoformat(),
+            created_at=time.time_ns(),
         )
         return masked
 
+    def store_batch(self, originals: list[str], format_str: str = _DEFAULT_FORMAT) -> list[str]:
+        """Store many originals at once; returns placeholders in matching order.
+
+        Equivalent to calling :meth:`store` for each value, but shares one
+        timestamp and inserts all mappings with a single ``dict.update``.
+        """
+        created_at = time.time_ns()
+        if format_str == _DEFAULT_FORMAT:
+            placeholders = ["VAL_" + secrets.token_hex(6) for _ in originals]
+        else:
+            placeholders = [format_str.format(uuid=secrets.token_hex(6)) for _ in originals]
+        self.entries.update(
+            (masked, VaultEntry(original, created_at))
+            for masked, original in zip(placeholders, originals)
+        )
+        return placeholders
+
     def restore(self, masked: str) -> str | None:
         """Look up the original value for a masked placeholder.
 
@@ -60,19 +134,30 @@ class Vault:
     # ------------------------------------------------------------------
 
     def save(self) -> Path:
-        """Persist current entries to the vault JSON file."""
-        data = {key: asdict(entry) for key, entry in self.entries.items()}
+        """Persist current entries to the vault JSON file.
+
+        Inside a ``with vault:`` block this is a no-op; the write happens
+        once when the block exits.
+        """
+        if self._deferred:
+            return self.path
+        payload = _json.dumps(self.entries, indent=True, default=_entry_to_json)
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.path.write_text(json.dumps(data, indent=2))
+        self.path.write_bytes(payload)
         return self.path
 
     def load(self) -> None:
-        """Load entries from an existing vault file on disk."""
+        """Load entries from an existing vault file on disk.
+
+        Files written before ``masked_value`` was dropped still load; the
+        redundant field is ignored.
+        """
         if not self.path.exists():
             return
-        raw = json.loads(self.path.read_text())
+        raw = _json.loads(self.path.read_bytes())
         self.entries = {
-            key: VaultEntry(**vals) for key, vals in raw.items()
+            key: VaultEntry(vals["original_value"], _parse_timestamp(vals["created_at"]))
+            for key, vals in raw.items()
         }
 
     # ------------------------------------------------------------------
@@ -88,28 +173,40 @@ class Vault:
         Returns:
             The original value if found, otherwise the original value unchanged.
         """
-        # Check if this looks like a masked value
-        if self.restore(value) is not None:
-            return self.restore(value)
-        return value
+        entry = self.entries.get(value)
+        return entry.original_value if entry is not None else value
 
     def rehydrate_dict(self, data: dict) -> dict:
         """Rehydrate all values in a dictionary.
 
-        Recursively processes nested dicts and lists.
+        Walks nested dicts and lists iteratively and replaces placeholders
+        in place, so no containers are copied.
 
         Args:
             data: Dictionary with potentially masked values
 
         Returns:
-            New dictionary with original values restored
+            The same object, with original values restored
         """
-        if isinstance(data, dict):
-            return {k: self.rehydrate_dict(v) for k, v in data.items()}
-        elif isinstance(data, list):
-            return [self.rehydrate_dict(item) for item in data]
-        elif isinstance(data, str):
+        entries = self.entries
+        if not entries:
+            return data
+        if isinstance(data, str):
             return self.rehydrate_value(data)
+        if not isinstance(data, (dict, list)):
+            return data
+
+        stack = [data]
+        while stack:
+            node = stack.pop()
+            items = node.items() if isinstance(node, dict) else enumerate(node)
+            for key, value in items:
+                if isinstance(value, str):
+                    entry = entries.get(value)
+                    if entry is not None:
+                        node[key] = entry.original_value
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
         return data
 
     def rehydrate_xml(self, xml_content: str) -> str:
@@ -121,14 +218,17 @@ class Vault:
         Returns:
             XML string with original values restored
         """
+        entries = self.entries
+        if not entries:
+            return xml_content
+
         # Find all VAL_xxx patterns and replace with originals
-        def replace_match(match):
+        def replace_match(match: re.Match[str]) -> str:
             masked = match.group(0)
-            original = self.restore(masked)
-            return original if original is not None else masked
+            entry = entries.get(masked)
+            return entry.original_value if entry is not None else masked
 
-        # Match VAL_ followed by alphanumeric characters
-        return re.sub(r"VAL_[a-zA-Z0-9]+", replace_match, xml_content)
+        return _PLACEHOLDER_RE.sub(replace_match, xml_content)
 
     # ------------------------------------------------------------------
     # Helpers
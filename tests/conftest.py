@@ -2,39 +2,95 @@
 
 from __future__ import annotations
 
+import re
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import pytest
 
+if TYPE_CHECKING:
+    from lxml import etree
+
+    from src.policy_engine import Policy
+
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w.-]")
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def fixtures_dir() -> Path:
     """Return the path to the test fixtures directory."""
     return FIXTURES_DIR
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_xml_path(fixtures_dir: Path) -> Path:
     """Return the path to the sample XML fixture."""
     return fixtures_dir / "sample.xml"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_xml(sample_xml_path: Path) -> str:
-    """Return the raw content of the sample XML fixture."""
+    """Return the raw content of the sample XML fixture (read once per session)."""
     return sample_xml_path.read_text()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def parsed_sample_xml(sample_xml: str) -> etree._Element:
+    """Return the sample XML parsed once per session.
+
+    Shared across tests: treat it as read-only, or ``copy.deepcopy`` it first.
+    """
+    from lxml import etree
+
+    return etree.fromstring(sample_xml.encode())
+
+
+@pytest.fixture(scope="session")
+def sample_element_ids(parsed_sample_xml: etree._Element) -> tuple[str, ...]:
+    """Return the ids of the sample's ``<element>`` children, in document order."""
+    return tuple(parsed_sample_xml.xpath("element/@id", smart_strings=False))
+
+
+@pytest.fixture(scope="session")
+def sample_pressures(parsed_sample_xml: etree._Element) -> dict[str, str | None]:
+    """Map each sample ``<element>`` id to its ``<pressure>`` text (read-only)."""
+    return {
+        elem.get("id"): elem.find("pressure").text
+        for elem in parsed_sample_xml.xpath("element[pressure]")
+    }
+
+
+@pytest.fixture(scope="session")
 def policy_test_path(fixtures_dir: Path) -> Path:
     """Return the path to the test policy JSON fixture."""
     return fixtures_dir / "policy_test.json"
 
 
+@pytest.fixture(scope="session")
+def loaded_policy(policy_test_path: Path) -> Policy:
+    """Return the test policy fixture, loaded once per session (read-only)."""
+    from src.policy_engine import load_policy
+
+    return load_policy(policy_test_path)
+
+
+@pytest.fixture(scope="session")
+def session_vault_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Return one directory that holds every test's vault file."""
+    return tmp_path_factory.mktemp("vaults")
+
+
 @pytest.fixture
-def tmp_vault(tmp_path: Path) -> Path:
-    """Return a temporary path for vault storage during tests."""
-    return tmp_path / "test_vault.json"
+def tmp_vault(session_vault_dir: Path, request: pytest.FixtureRequest) -> Path:
+    """Return a temporary path for vault storage during tests.
+
+    Each test gets its own file, named after its node id, inside the shared
+    session directory instead of a fresh per-test directory.
+    """
+    path = session_vault_dir / (_UNSAFE_FILENAME_CHARS.sub("_", request.node.nodeid) + ".json")
+    path.unlink(missing_ok=True)
+    return path
+
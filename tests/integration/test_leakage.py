@@ -18,46 +18,52 @@ PROPRIETARY_TAGS = {"pressure", "temperature", "velocity", "coordinates"}
 
 # The original numeric values from sample.xml
 ORIGINAL_NUMERIC_VALUES = [
-    "123.45", "500.0", "25.5",    # element e1
-    "678.90", "600.0", "30.2",    # element e2
-    "10.5", "20.3", "30.7",       # node n1 coordinates
+    b"123.45", b"500.0", b"25.5",    # element e1
+    b"678.90", b"600.0", b"30.2",    # element e2
+    b"10.5", b"20.3", b"30.7",       # node n1 coordinates
 ]
 
+# One pass over the output finds a leak of any of the values above.
+_LEAK_RE = re.compile(b"|".join(re.escape(v) for v in ORIGINAL_NUMERIC_VALUES))
+
 
 class TestNoNumericLeakage:
     """Verify that no original numeric values survive the gatekeeper pipeline."""
 
     @pytest.fixture
-    def config(self) -> PolicyEngineConfig:
-        return PolicyEngineConfig()
+    def config(self, tmp_vault: Path) -> PolicyEngineConfig:
+        return PolicyEngineConfig(vault_path=tmp_vault)
 
     def test_no_numeric_values_in_output(
-        self, sample_xml_path: Path, policy_test_path: Path, config: PolicyEngineConfig
+        self,
+        sample_xml_path: Path,
+        loaded_policy: Policy,
+        config: PolicyEngineConfig,
+        tmp_path: Path,
     ):
         """The sanitized output must not contain any of the original numeric values."""
-        policy = Policy.load(policy_test_path)
         sanitized_xml, _vault_path = apply_gatekeeper(
-            sample_xml_path, policy, config
+            sample_xml_path, loaded_policy, config, output_dir=tmp_path
         )
 
-        output_text = sanitized_xml.read_text() if isinstance(sanitized_xml, Path) else sanitized_xml
-
-        for value in ORIGINAL_NUMERIC_VALUES:
-            assert value not in output_text, (
-                f"Original numeric value '{value}' leaked into sanitized output"
-            )
+        leaked = _LEAK_RE.findall(sanitized_xml.read_bytes())
+        assert not leaked, (
+            f"Original numeric values leaked into sanitized output: {leaked}"
+        )
 
     def test_no_floating_point_patterns_in_text_nodes(
-        self, sample_xml_path: Path, policy_test_path: Path, config: PolicyEngineConfig
+        self,
+        sample_xml_path: Path,
+        loaded_policy: Policy,
+        config: PolicyEngineConfig,
+        tmp_path: Path,
     ):
         """Text content of elements should not contain raw floating-point patterns."""
-        policy = Policy.load(policy_test_path)
         sanitized_xml, _vault_path = apply_gatekeeper(
-            sample_xml_path, policy, config
+            sample_xml_path, loaded_policy, config, output_dir=tmp_path
         )
 
-        output_text = sanitized_xml.read_text() if isinstance(sanitized_xml, Path) else sanitized_xml
-        tree = etree.fromstring(output_text.encode())
+        tree = etree.fromstring(sanitized_xml.read_bytes())
 
         for elem in tree.iter():
             if elem.text and elem.text.strip():
@@ -76,20 +82,22 @@ class TestNoProprietaryTagsExposed:
     """Verify that proprietary/sensitive tag names are shadowed or removed."""
 
     @pytest.fixture
-    def config(self) -> PolicyEngineConfig:
-        return PolicyEngineConfig()
+    def config(self, tmp_vault: Path) -> PolicyEngineConfig:
+        return PolicyEngineConfig(vault_path=tmp_vault)
 
     def test_no_proprietary_tags_exposed(
-        self, sample_xml_path: Path, policy_test_path: Path, config: PolicyEngineConfig
+        self,
+        sample_xml_path: Path,
+        loaded_policy: Policy,
+        config: PolicyEngineConfig,
+        tmp_path: Path,
     ):
         """Proprietary tag names like 'pressure', 'temperature' should be shadowed."""
-        policy = Policy.load(policy_test_path)
         sanitized_xml, _vault_path = apply_gatekeeper(
-            sample_xml_path, policy, config
+            sample_xml_path, loaded_policy, config, output_dir=tmp_path
         )
 
-        output_text = sanitized_xml.read_text() if isinstance(sanitized_xml, Path) else sanitized_xml
-        tree = etree.fromstring(output_text.encode())
+        tree = etree.fromstring(sanitized_xml.read_bytes())
 
         exposed_tags = set()
         for elem in tree.iter():
@@ -101,16 +109,18 @@ class TestNoProprietaryTagsExposed:
         )
 
     def test_shadowed_tags_are_present(
-        self, sample_xml_path: Path, policy_test_path: Path, config: PolicyEngineConfig
+        self,
+        sample_xml_path: Path,
+        loaded_policy: Policy,
+        config: PolicyEngineConfig,
+        tmp_path: Path,
     ):
         """The output should contain shadowed versions of proprietary tags."""
-        policy = Policy.load(policy_test_path)
         sanitized_xml, _vault_path = apply_gatekeeper(
-            sample_xml_path, policy, config
+            sample_xml_path, loaded_policy, config, output_dir=tmp_path
         )
 
-        output_text = sanitized_xml.read_text() if isinstance(sanitized_xml, Path) else sanitized_xml
-        tree = etree.fromstring(output_text.encode())
+        tree = etree.fromstring(sanitized_xml.read_bytes())
 
         all_tags = {elem.tag for elem in tree.iter()}
 
@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import re
+import shutil
+from pathlib import Path
+
 import pytest
 from mcp.client.session import ClientSession
 from mcp.server import Server
@@ -10,7 +14,10 @@ from mcp.shared.memory import (
     create_connected_server_and_client_session as create_session,
 )
 
+from src import server
+from src.config import PolicyEngineConfig
 from src.server import app
+from src.vault import Vault
 
 
 @pytest.fixture
@@ -93,3 +100,63 @@ class TestMCPProtocol:
 
         assert result is not None
         assert len(result.content) > 0
+
+
+class TestBatchReadSafeStructure:
+    """Call the batch handler directly against temporary input and policy dirs."""
+
+    @pytest.fixture
+    def batch_env(
+        self,
+        sample_xml_path: Path,
+        policy_test_path: Path,
+        tmp_path: Path,
+        tmp_vault: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> Path:
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        for name in ("a.xml", "b.xml"):
+            shutil.copyfile(sample_xml_path, input_dir / name)
+        shutil.copyfile(policy_test_path, tmp_path / "policy_locked.json")
+
+        monkeypatch.setattr(server, "DATA_INPUT_DIR", input_dir)
+        monkeypatch.setattr(server, "POLICY_DIR", tmp_path)
+        monkeypatch.setattr(
+            "src.config.load_config", lambda: PolicyEngineConfig(vault_path=tmp_vault)
+        )
+        return tmp_vault
+
+    async def test_batch_shares_one_vault_write(
+        self, batch_env: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Both files are sanitized into one vault, which is written exactly once."""
+        writes: list[Path] = []
+        real_save = Vault.save
+
+        def counting_save(vault: Vault) -> Path:
+            if not vault._deferred:
+                writes.append(vault.path)
+            return real_save(vault)
+
+        monkeypatch.setattr(Vault, "save", counting_save)
+
+        result = await server._handle_batch_read_safe_structure(
+            {"filepaths": ["a.xml", "b.xml"]}
+        )
+
+        assert len(result) == 2
+        assert writes == [batch_env]
+
+        vault = Vault(batch_env)
+        vault.load()
+        for content in result:
+            placeholders = re.findall(r"VAL_[0-9a-f]+", content.text)
+            assert placeholders, "Each file should contain masked values"
+            assert all(p in vault for p in placeholders)
+
+    @pytest.mark.parametrize("filepaths", ["a.xml", ["a.xml", 1]])
+    async def test_batch_rejects_non_string_list(self, batch_env: Path, filepaths):
+        """filepaths must be a list of strings, not a string iterated per character."""
+        with pytest.raises(ValueError, match="list of strings"):
+            await server._handle_batch_read_safe_structure({"filepaths": filepaths})
@@ -2,33 +2,57 @@
 
 from __future__ import annotations
 
-import json
+import copy
 import re
+from itertools import chain
 from pathlib import Path
 
 import pytest
 from lxml import etree
 
+from src import _json
 from src.config import MaskingConfig, PolicyEngineConfig
-from src.gatekeeper import apply_gatekeeper, mask_values
+from src.gatekeeper import apply_gatekeeper, mask_values, sanitize_xml
 from src.policy_engine import Policy
 from src.vault import Vault
 
+_NUM_ANCHORED = re.compile(r"-?\d+\.?\d*$")
+# Any match of _NUM_ANCHORED starts with one of these; checked first so
+# non-numeric strings skip the regex entirely.
+_NUM_STARTS = frozenset("-0123456789")
+
+
+# Coordinate attribute values of node n1 in sample.xml
+COORDINATE_VALUES = [b"10.5", b"20.3", b"30.7"]
 
 # All original numeric values from sample.xml
 ORIGINAL_NUMERIC_VALUES = [
-    "123.45", "500.0", "25.5",    # element e1
-    "678.90", "600.0", "30.2",    # element e2
-    "10.5", "20.3", "30.7",       # node n1 coordinates
+    b"123.45", b"500.0", b"25.5",    # element e1
+    b"678.90", b"600.0", b"30.2",    # element e2
+    *COORDINATE_VALUES,              # node n1 coordinates
 ]
 
 
+def _any_of(values: list[bytes]) -> re.Pattern[bytes]:
+    """Compile one pattern that finds any of *values* in a single pass."""
+    return re.compile(b"|".join(re.escape(v) for v in values))
+
+
+_LEAK_RE = _any_of(ORIGINAL_NUMERIC_VALUES)
+_COORD_LEAK_RE = _any_of(COORDINATE_VALUES)
+
+
+def _load_vault_json(path: Path) -> dict:
+    """Parse a vault file straight from bytes, with orjson when available."""
+    return _json.loads(path.read_bytes())
+
+
 class TestDataMaskingSecurity:
     """End-to-end security verification that masking is thorough."""
 
     @pytest.fixture
-    def config(self) -> PolicyEngineConfig:
-        return PolicyEngineConfig()
+    def config(self, tmp_vault: Path) -> PolicyEngineConfig:
+        return PolicyEngineConfig(vault_path=tmp_vault)
 
     @pytest.fixture
     def masking_config(self) -> MaskingConfig:
@@ -37,6 +61,7 @@ class TestDataMaskingSecurity:
     def test_masking_removes_all_sensitive_data(
         self,
         sample_xml: str,
+        parsed_sample_xml: etree._Element,
         masking_config: MaskingConfig,
         tmp_vault: Path,
     ):
@@ -47,15 +72,15 @@ class TestDataMaskingSecurity:
         output.
         """
         # Step 1: Extract all original numeric values
-        original_tree = etree.fromstring(sample_xml.encode())
+        original_tree = parsed_sample_xml
         original_values: set[str] = set()
 
-        for elem in original_tree.iter():
-            if elem.text and re.match(r"-?\d+\.?\d*$", elem.text.strip()):
-                original_values.add(elem.text.strip())
-            for attr_val in elem.attrib.values():
-                if re.match(r"-?\d+\.?\d*$", attr_val.strip()):
-                    original_values.add(attr_val.strip())
+        # itertext() and //@* yield plain strings, so no Element wrappers are
+        # built; together they still cover every text node and attribute.
+        for value in chain(original_tree.itertext(), original_tree.xpath("//@*")):
+            value = value.strip()
+            if value and value[0] in _NUM_STARTS and _NUM_ANCHORED.match(value):
+                original_values.add(value)
 
         assert len(original_values) > 0, "Test fixture should contain numeric values"
 
@@ -64,7 +89,8 @@ class TestDataMaskingSecurity:
         masked_xml = mask_values(sample_xml, masking_config, vault)
 
         # Step 3: Verify no original values leaked
-        leaked = [v for v in original_values if v in masked_xml]
+        leak_re = re.compile("|".join(map(re.escape, original_values)))
+        leaked = leak_re.findall(masked_xml)
         assert len(leaked) == 0, (
             f"Original numeric values leaked through masking: {leaked}"
         )
@@ -72,80 +98,92 @@ class TestDataMaskingSecurity:
     def test_full_pipeline_removes_all_sensitive_data(
         self,
         sample_xml_path: Path,
-        policy_test_path: Path,
+        loaded_policy: Policy,
         config: PolicyEngineConfig,
+        tmp_path: Path,
     ):
         """The full gatekeeper pipeline must remove all numeric values."""
-        policy = Policy.load(policy_test_path)
         sanitized_xml, _vault_path = apply_gatekeeper(
-            sample_xml_path, policy, config
+            sample_xml_path, loaded_policy, config, output_dir=tmp_path
         )
 
-        output_text = (
-            sanitized_xml.read_text()
-            if isinstance(sanitized_xml, Path)
-            else sanitized_xml
-        )
+        output_bytes = sanitized_xml.read_bytes()
 
-        for value in ORIGINAL_NUMERIC_VALUES:
-            assert value not in output_text, (
-                f"Original numeric value '{value}' leaked into sanitized output"
-            )
+        leaked = _LEAK_RE.findall(output_bytes)
+        assert not leaked, (
+            f"Original numeric values leaked into sanitized output: {leaked}"
+        )
 
     def test_vault_stores_all_originals(
         self,
         sample_xml_path: Path,
-        policy_test_path: Path,
+        loaded_policy: Policy,
         config: PolicyEngineConfig,
+        tmp_path: Path,
     ):
         """The vault must store all original values for restoration."""
-        policy = Policy.load(policy_test_path)
         _sanitized_xml, vault_path = apply_gatekeeper(
-            sample_xml_path, policy, config
+            sample_xml_path, loaded_policy, config, output_dir=tmp_path
         )
 
         assert vault_path.exists(), "Vault file should be created"
 
-        vault_data = json.loads(vault_path.read_text())
+        vault_data = _load_vault_json(vault_path)
         assert len(vault_data) > 0, "Vault should contain entries"
 
+    def test_in_memory_pipeline_writes_only_vault(
+        self,
+        sample_xml_path: Path,
+        loaded_policy: Policy,
+        tmp_path: Path,
+        tmp_vault: Path,
+    ):
+        """sanitize_xml must return masked XML without writing a sanitized file."""
+        xml_path = tmp_path / "sample.xml"
+        xml_path.write_bytes(sample_xml_path.read_bytes())
+        config = PolicyEngineConfig(vault_path=tmp_vault)
+
+        output_text, vault_path = sanitize_xml(
+            xml_path, loaded_policy, config
+        )
+
+        assert not list(tmp_path.glob("*_sanitized.xml"))
+        assert output_text.startswith("<?xml")
+        assert "VAL_" in output_text
+        assert len(_load_vault_json(vault_path)) > 0, "Vault should contain entries"
+
     def test_masking_produces_valid_xml(
         self,
-        sample_xml: str,
+        parsed_sample_xml: etree._Element,
         masking_config: MaskingConfig,
         tmp_vault: Path,
     ):
         """Masked output must still be well-formed XML."""
         vault = Vault(tmp_vault)
-        masked_xml = mask_values(sample_xml, masking_config, vault)
+        masked = mask_values(copy.deepcopy(parsed_sample_xml), masking_config, vault)
 
         try:
-            etree.fromstring(masked_xml.encode())
+            etree.fromstring(etree.tostring(masked))
         except etree.XMLSyntaxError as e:
             pytest.fail(f"Masked output is not valid XML: {e}")
 
     def test_no_attribute_leakage(
         self,
         sample_xml_path: Path,
-        policy_test_path: Path,
+        loaded_policy: Policy,
         config: PolicyEngineConfig,
+        tmp_path: Path,
     ):
         """Attributes containing sensitive numeric data must be masked."""
-        policy = Policy.load(policy_test_path)
         sanitized_xml, _vault_path = apply_gatekeeper(
-            sample_xml_path, policy, config
+            sample_xml_path, loaded_policy, config, output_dir=tmp_path
         )
 
-        output_text = (
-            sanitized_xml.read_text()
-            if isinstance(sanitized_xml, Path)
-            else sanitized_xml
-        )
+        output_bytes = sanitized_xml.read_bytes()
 
         # Original coordinate attribute values should not appear
-        assert "10.5" not in output_text
-        assert "20.3" not in output_text
-        assert "30.7" not in output_text
+        leaked = _COORD_LEAK_RE.findall(output_bytes)
+        assert not leaked, f"Coordinate values leaked into sanitized output: {leaked}"
 
     def test_masking_handles_nested_numerics(
         self,
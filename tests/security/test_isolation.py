@@ -3,11 +3,15 @@
 from __future__ import annotations
 
 import os
-import subprocess
+import re
 from pathlib import Path
 
 import pytest
 
+from src import security
+
+_NO_NEW_PRIVS_RE = re.compile(rb"^NoNewPrivs:\s*(\d+)", re.MULTILINE)
+
 
 class TestProcessIsolation:
     """Verify that the process runs with restricted privileges."""
@@ -18,21 +22,14 @@ class TestProcessIsolation:
         In a container, this verifies the USER directive works.
         On a dev machine, this passes unless tests are run as root.
         """
-        try:
-            result = subprocess.run(
-                ["id", "-u"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                check=True,
-            )
-            uid = result.stdout.strip()
-            assert uid != "0", (
-                f"Process is running as root (UID={uid}). "
-                "The application should run as a non-root user."
-            )
-        except FileNotFoundError:
-            pytest.skip("id command not available")
+        if not hasattr(os, "geteuid"):
+            pytest.skip("os.geteuid() not available on this platform")
+
+        uid = os.geteuid()
+        assert uid != 0, (
+            f"Process is running as root (UID={uid}). "
+            "The application should run as a non-root user."
+        )
 
     def test_no_new_privileges(self):
         """In a container with no-new-privileges, NoNewPrivs should be set.
@@ -47,18 +44,90 @@ class TestProcessIsolation:
                 "skipping no-new-privileges check"
             )
 
-        status_content = Path(status_path).read_text()
+        match = _NO_NEW_PRIVS_RE.search(Path(status_path).read_bytes())
+        if match is None:
+            pytest.skip("NoNewPrivs field not found in /proc/self/status")
+
+        value = match.group(1).decode()
+        assert value == "1", (
+            f"NoNewPrivs should be 1 (enabled), got: {value}. "
+            "Ensure 'no-new-privileges:true' is set in Docker security_opt."
+        )
+
+
+def _status_blob(cap_eff: str | None) -> bytes:
+    """Build /proc/self/status content, newline-prefixed as _status_field expects."""
+    lines = [b"Name:\tpython", b"NoNewPrivs:\t1"]
+    if cap_eff is not None:
+        lines.append(b"CapEff:\t" + cap_eff.encode())
+    lines.append(b"Seccomp:\t2")
+    return b"\n" + b"\n".join(lines) + b"\n"
+
+
+class TestCapabilityParsing:
+    """Verify CapEff parsing against fabricated /proc/self/status content."""
+
+    def test_cap_sys_admin_is_reported(self):
+        """Bit 21 (CAP_SYS_ADMIN) in CapEff must be flagged."""
+        issues = security._capability_issues(_status_blob(f"{1 << 21:016x}"))
+
+        assert issues is not None
+        assert len(issues) == 1
+        assert "cap_sys_admin" in issues[0]
+
+    def test_empty_mask_has_no_issues(self):
+        """A CapEff of all zeros grants nothing dangerous."""
+        assert security._capability_issues(_status_blob("0000000000000000")) == []
+
+    def test_full_root_mask_reports_every_dangerous_cap(self):
+        """An unrestricted root mask must report every capability being checked."""
+        issues = security._capability_issues(_status_blob("000001ffffffffff"))
+
+        assert issues is not None
+        assert len(issues) == len(security._DANGEROUS_CAP_BITS)
+
+    @pytest.mark.parametrize("cap_eff", [None, "not-hex"])
+    def test_missing_or_malformed_capeff_falls_back(self, cap_eff: str | None):
+        """Without a parseable CapEff line the caller must fall back to capsh."""
+        assert security._capability_issues(_status_blob(cap_eff)) is None
+
+    def test_first_status_field_is_found(self):
+        """The leading newline lets the very first field be located too."""
+        assert security._status_field(_status_blob(None), b"Name") == b"python"
+
+
+class TestFilesystemProbe:
+    """Verify the cached directory writability probe."""
+
+    def test_writable_verdict_is_rechecked_after_ttl(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """A cached verdict is reused within the TTL and re-probed after it."""
+        monkeypatch.setattr(security, "_WRITABLE_CACHE", {})
+        assert security._probe_dir(tmp_path) == (True, True)
+
+        # Simulate a read-only remount.
+        monkeypatch.setattr(security.os, "access", lambda *args, **kwargs: False)
+        assert security._probe_dir(tmp_path) == (True, True)
+
+        monkeypatch.setattr(security, "_WRITABLE_TTL", -1.0)
+        assert security._probe_dir(tmp_path) == (True, False)
+
+    def test_probe_checks_write_and_search_permission(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Creating a file needs both write and search permission on the directory."""
+        monkeypatch.setattr(security, "_WRITABLE_CACHE", {})
+        modes: list[int] = []
+
+        def fake_access(path: str, mode: int, **kwargs: object) -> bool:
+            modes.append(mode)
+            return True
 
-        for line in status_content.splitlines():
-            if line.startswith("NoNewPrivs:"):
-                value = line.split(":")[1].strip()
-                assert value == "1", (
-                    f"NoNewPrivs should be 1 (enabled), got: {value}. "
-                    "Ensure 'no-new-privileges:true' is set in Docker security_opt."
-                )
-                return
+        monkeypatch.setattr(security.os, "access", fake_access)
+        security._probe_dir(tmp_path)
 
-        pytest.skip("NoNewPrivs field not found in /proc/self/status")
+        assert modes == [os.W_OK | os.X_OK]
 
 
 class TestEnvironmentSecurity:
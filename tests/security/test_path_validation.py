@@ -0,0 +1,119 @@
+"""Security tests for input, policy, vault and output path validation in the MCP server."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from src import server
+
+
+class TestInputPathValidation:
+    """Verify that tool calls cannot read files outside the input directory."""
+
+    @pytest.fixture
+    def input_root(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        root = tmp_path / "input"
+        root.mkdir()
+        (root / "sample.xml").write_text("<root/>")
+        monkeypatch.setattr(server, "DATA_INPUT_DIR", root)
+        return root
+
+    def test_relative_path_inside_root_allowed(self, input_root: Path):
+        """Relative paths resolve against the input directory."""
+        assert server._resolve_input_path("sample.xml") == (input_root / "sample.xml").resolve()
+
+    def test_parent_traversal_blocked(self, input_root: Path):
+        """'..' segments must not escape the input directory."""
+        (input_root.parent / "secret.xml").write_text("<secret/>")
+        with pytest.raises(ValueError, match="Access denied"):
+            server._resolve_input_path("../secret.xml")
+
+    def test_sibling_prefix_directory_blocked(self, input_root: Path):
+        """A sibling directory sharing the root's name as a prefix is outside it."""
+        evil = input_root.parent / "input_evil"
+        evil.mkdir()
+        (evil / "x.xml").write_text("<x/>")
+        with pytest.raises(ValueError, match="Access denied"):
+            server._resolve_input_path(str(evil / "x.xml"))
+
+
+class TestPolicyPathValidation:
+    """Verify that the policy argument cannot load files outside the policy directory."""
+
+    @pytest.fixture
+    def policy_root(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        root = tmp_path / "config"
+        root.mkdir()
+        (root / "policy_locked.json").write_text("{}")
+        monkeypatch.setattr(server, "POLICY_DIR", root)
+        return root
+
+    def test_relative_policy_inside_root_allowed(self, policy_root: Path):
+        """Policy names resolve against the policy directory."""
+        assert (
+            server._resolve_policy_file("policy_locked.json")
+            == (policy_root / "policy_locked.json").resolve()
+        )
+
+    def test_policy_parent_traversal_blocked(self, policy_root: Path):
+        """'..' segments must not escape the policy directory."""
+        (policy_root.parent / "other.json").write_text("{}")
+        with pytest.raises(ValueError, match="Access denied"):
+            server._resolve_policy_file("../other.json")
+
+    def test_absolute_policy_outside_root_blocked(self, policy_root: Path):
+        """Absolute paths are accepted only when they point inside the policy directory."""
+        outside = policy_root.parent / "config_evil" / "policy.json"
+        outside.parent.mkdir()
+        outside.write_text("{}")
+        with pytest.raises(ValueError, match="Access denied"):
+            server._resolve_policy_file(str(outside))
+
+
+class TestVaultPathValidation:
+    """Verify that session ids cannot address files outside the vault directory."""
+
+    @pytest.fixture
+    def vault_root(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        root = tmp_path / "vault"
+        root.mkdir()
+        monkeypatch.setattr(server, "VAULT_DIR", root)
+        return root
+
+    @pytest.mark.parametrize("session_id", ["../escape", "/tmp/escape"])
+    async def test_session_id_traversal_blocked(self, vault_root: Path, session_id: str):
+        """A session id that walks out of the vault directory is refused."""
+        with pytest.raises(ValueError, match="Access denied"):
+            await server._handle_get_vault_info({"session_id": session_id})
+
+    async def test_session_id_inside_root_allowed(self, vault_root: Path):
+        """A plain session id is looked up inside the vault directory."""
+        result = await server._handle_get_vault_info({"session_id": "missing"})
+        assert "No vault found" in result[0].text
+
+
+class TestOutputPathValidation:
+    """Verify that session ids cannot write optimizations outside the output directory."""
+
+    @pytest.fixture
+    def output_root(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        root = tmp_path / "output"
+        monkeypatch.setattr(server, "DATA_OUTPUT_DIR", root)
+        return root
+
+    async def test_session_id_traversal_blocked(self, output_root: Path):
+        """A session id that walks out of the output directory is refused before writing."""
+        with pytest.raises(ValueError, match="Access denied"):
+            await server._handle_submit_optimization(
+                {"session_id": "../escape", "proposed_changes": [{"x": 1}]}
+            )
+        assert not (output_root.parent / "escape_optimization.json").exists()
+
+    async def test_submission_written_inside_root(self, output_root: Path):
+        """A plain session id is written inside the output directory, created on demand."""
+        await server._handle_submit_optimization(
+            {"session_id": "s1", "proposed_changes": [{"x": 1}]}
+        )
+        assert (output_root / "s1_optimization.json").exists()
@@ -0,0 +1,76 @@
+"""Tests for configuration loading."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from src.config import PolicyEngineConfig, load_config
+
+
+class TestLoadConfig:
+    """Verify YAML loading and the per-file-version parse cache."""
+
+    def test_missing_file_returns_defaults(self, tmp_path: Path):
+        """A non-existent config path should fall back to defaults."""
+        config = load_config(tmp_path / "missing.yaml")
+        assert config == PolicyEngineConfig()
+
+    def test_cached_config_is_copied(self, tmp_path: Path):
+        """Mutating a returned config must not affect later loads."""
+        path = tmp_path / "config.yaml"
+        path.write_text("shuffling:\n  seed: 7\n")
+
+        first = load_config(path)
+        first.shuffling.target_tags.append("mutated")
+        second = load_config(path)
+
+        assert second.shuffling.seed == 7
+        assert "mutated" not in second.shuffling.target_tags
+
+    def test_modified_file_is_reparsed(self, tmp_path: Path):
+        """Rewriting the config file must invalidate the cached parse."""
+        path = tmp_path / "config.yaml"
+        path.write_text("shuffling:\n  seed: 7\n")
+        assert load_config(path).shuffling.seed == 7
+
+        path.write_text("shuffling:\n  seed: 42\n")
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert load_config(path).shuffling.seed == 42
+
+    @pytest.mark.parametrize(
+        ("raw", "expected"),
+        [("false", False), ("'false'", False), ("'True'", True), ("0", False), ("'off'", False)],
+    )
+    def test_boolean_strings_are_parsed(self, tmp_path: Path, raw: str, expected: bool):
+        """Quoted true/false spellings must not all coerce to True."""
+        path = tmp_path / "config.yaml"
+        path.write_text(f"strict_mode: {raw}\nshuffling:\n  enabled: {raw}\n")
+
+        config = load_config(path)
+
+        assert config.strict_mode is expected
+        assert config.shuffling.enabled is expected
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "shuffling:\n  enabled: maybe\n",
+            "strict_mode: 2\n",
+            "shuffling:\n  seed: true\n",
+            "shuffling:\n  seed: 1.5\n",
+            "masking:\n  value_pattern: null\n",
+            "masking:\n  preserve_attributes: id\n",
+            "vault:\n  path: null\n",
+        ],
+    )
+    def test_invalid_values_are_rejected(self, tmp_path: Path, content: str):
+        """Values of the wrong type must raise instead of being silently coerced."""
+        path = tmp_path / "config.yaml"
+        path.write_text(content)
+
+        with pytest.raises(ValueError, match="Config value"):
+            load_config(path)
@@ -0,0 +1,47 @@
+"""Tests for policy generation from XML structure."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from src.policy_engine import generate_policy
+
+
+def _rule_summary(path: Path) -> list[tuple[str, str, str | None]]:
+    """Return ``(tag_pattern, action, child_tag)`` for each generated rule, in order."""
+    return [
+        (r.tag_pattern, r.action, (r.parameters or {}).get("child_tag"))
+        for r in generate_policy(path).rules
+    ]
+
+
+class TestGeneratePolicy:
+    """Pin the rules generate_policy emits and the order they come out in."""
+
+    def test_sample_rules_in_document_order(self, sample_xml_path: Path):
+        """The sample yields one shuffle rule and its mask rules, in document order."""
+        assert _rule_summary(sample_xml_path) == [
+            ("simulation", "shuffle_siblings", "element"),
+            ("pressure", "mask_value", None),
+            ("temperature", "mask_value", None),
+            ("velocity", "mask_value", None),
+            ("coordinates", "mask_value", None),
+        ]
+
+    def test_nested_repeated_siblings_in_document_order(self, tmp_path: Path):
+        """Outer shuffle rules must precede the rules of the groups nested inside them."""
+        path = tmp_path / "nested.xml"
+        path.write_text(
+            "<plant>"
+            "<unit><stage><step/><step/></stage><stage><step/></stage></unit>"
+            "<unit><stage><step/><step/></stage></unit>"
+            "<load>4.2</load>"
+            "</plant>"
+        )
+
+        assert _rule_summary(path) == [
+            ("plant", "shuffle_siblings", "unit"),
+            ("unit", "shuffle_siblings", "stage"),
+            ("stage", "shuffle_siblings", "step"),
+            ("load", "mask_value", None),
+        ]
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import copy
+from collections import Counter
+
 from lxml import etree
 import pytest
 
@@ -9,99 +12,151 @@ from src.config import ShufflingConfig
 from src.gatekeeper import shuffle_siblings
 
 
+# One parser reused for every result parse in this module.
+_PARSER = etree.XMLParser(collect_ids=False)
+_ELEMENT_IDS = etree.XPath("element/@id", smart_strings=False)
+_PRESSURED_ELEMENTS = etree.XPath("element[pressure]")
+_META_ORDER_KEPT = etree.XPath("boolean(meta[1]/a) and boolean(meta[2]/b)")
+
+
+def _pressures_by_id(tree: etree._Element) -> dict[str, str | None]:
+    """Map each <element> id to its <pressure> text."""
+    return {elem.get("id"): elem.find("pressure").text for elem in _PRESSURED_ELEMENTS(tree)}
+
+
+@pytest.fixture(scope="module")
+def shuffling_config() -> ShufflingConfig:
+    """Shuffle <element> and <node> children with a random seed."""
+    return ShufflingConfig(enabled=True, target_tags=["element", "node"])
+
+
+@pytest.fixture(scope="module")
+def config_seed42() -> ShufflingConfig:
+    return ShufflingConfig(enabled=True, seed=42, target_tags=["element"])
+
+
+@pytest.fixture(scope="module")
+def config_seed99() -> ShufflingConfig:
+    return ShufflingConfig(enabled=True, seed=99, target_tags=["element"])
+
+
+@pytest.fixture(scope="module")
+def config_disabled() -> ShufflingConfig:
+    return ShufflingConfig(enabled=False)
+
+
+@pytest.fixture(scope="module")
+def shuffled_trees(
+    parsed_sample_xml: etree._Element,
+    sample_element_ids: tuple[str, ...],
+    shuffling_config: ShufflingConfig,
+) -> list[etree._Element]:
+    """Shuffle the sample up to 20 times, stopping at the first reordering.
+
+    Shared by the ordering and content tests so each shuffle and parse
+    runs once for both.
+    """
+    # Ids joined with a unit separator, so each order check is one str compare.
+    original_key = "\x1f".join(sample_element_ids)
+    trees = []
+    for _ in range(20):
+        # A copy of the parsed sample spares shuffle_siblings an encode
+        # and parse per iteration; its str result has no XML declaration,
+        # so it parses without re-encoding.
+        result_xml = shuffle_siblings(copy.deepcopy(parsed_sample_xml), shuffling_config)
+        result_tree = etree.fromstring(result_xml, _PARSER)
+        trees.append(result_tree)
+        if "\x1f".join(_ELEMENT_IDS(result_tree)) != original_key:
+            break
+    return trees
+
+
 class TestShuffleSiblings:
     """Verify that sibling elements are reordered to break positional inference."""
 
-    @pytest.fixture
-    def shuffling_config(self) -> ShufflingConfig:
-        return ShufflingConfig(enabled=True, target_tags=["element", "node"])
-
     def test_shuffle_siblings_reorders_elements(
-        self, sample_xml: str, shuffling_config: ShufflingConfig
+        self, sample_element_ids: tuple[str, ...], shuffled_trees: list[etree._Element]
     ):
         """Shuffling must change the order of sibling <element> tags.
 
         Since shuffling is random, we run multiple iterations and verify that
         at least one produces a different order than the original.
         """
-        original_tree = etree.fromstring(sample_xml.encode())
-        original_ids = [
-            elem.get("id") for elem in original_tree.findall("element")
-        ]
-
-        found_different_order = False
-        for _ in range(20):
-            result_xml = shuffle_siblings(sample_xml, shuffling_config)
-            result_tree = etree.fromstring(result_xml.encode())
-            result_ids = [
-                elem.get("id") for elem in result_tree.findall("element")
-            ]
+        seen_orders = {tuple(_ELEMENT_IDS(tree)) for tree in shuffled_trees}
 
-            # All original elements must still be present
-            assert sorted(result_ids) == sorted(original_ids), (
+        # All original elements must still be present in every distinct order
+        original_counts = Counter(sample_element_ids)
+        for order in seen_orders:
+            assert Counter(order) == original_counts, (
                 "Shuffling must not add or remove elements"
             )
 
-            if result_ids != original_ids:
-                found_different_order = True
-                break
-
-        assert found_different_order, (
+        assert any(order != sample_element_ids for order in seen_orders), (
             "Shuffling did not reorder elements in 20 attempts "
             "(statistically extremely unlikely unless shuffling is broken)"
         )
 
     def test_shuffle_preserves_element_content(
-        self, sample_xml: str, shuffling_config: ShufflingConfig
+        self,
+        sample_pressures: dict[str, str | None],
+        shuffled_trees: list[etree._Element],
     ):
         """Shuffling must not alter the content of individual elements."""
-        original_tree = etree.fromstring(sample_xml.encode())
-        original_pressures = {}
-        for elem in original_tree.findall("element"):
-            eid = elem.get("id")
-            pressure = elem.find("pressure")
-            if pressure is not None:
-                original_pressures[eid] = pressure.text
-
-        result_xml = shuffle_siblings(sample_xml, shuffling_config)
-        result_tree = etree.fromstring(result_xml.encode())
-        for elem in result_tree.findall("element"):
-            eid = elem.get("id")
-            pressure = elem.find("pressure")
-            if pressure is not None:
-                assert pressure.text == original_pressures[eid], (
-                    f"Element {eid} pressure changed after shuffling"
-                )
+        for result_tree in shuffled_trees:
+            assert _pressures_by_id(result_tree) == sample_pressures, (
+                "Element pressures changed after shuffling"
+            )
 
     def test_shuffle_only_targets_configured_tags(self):
         """Tags not listed in target_tags should remain in original order."""
         config = ShufflingConfig(enabled=True, target_tags=["element"])
-        xml = """<root>
+        xml = b"""<root>
             <meta><a>1</a></meta>
             <meta><b>2</b></meta>
             <element id="e1"><v>10</v></element>
             <element id="e2"><v>20</v></element>
         </root>"""
 
-        result_xml = shuffle_siblings(xml, config)
-        tree = etree.fromstring(result_xml.encode())
+        # Parse the bytes literal directly and hand shuffle_siblings the
+        # element, so neither the input nor the declaration-free str result
+        # needs encoding.
+        result_xml = shuffle_siblings(etree.fromstring(xml, _PARSER), config)
+        tree = etree.fromstring(result_xml, _PARSER)
 
         # <meta> tags should keep their order
-        metas = tree.findall("meta")
-        assert metas[0].find("a") is not None, (
-            "First <meta> should still contain <a>"
-        )
-        assert metas[1].find("b") is not None, (
-            "Second <meta> should still contain <b>"
+        assert _META_ORDER_KEPT(tree), (
+            "First <meta> should still contain <a> and the second <b>"
         )
 
 
 class TestDeterministicShuffling:
     """Verify that shuffling is reproducible with a fixed seed."""
 
-    def test_deterministic_shuffling_with_seed(self, sample_xml: str):
+    def test_nested_parents_keep_seeded_order(self):
+        """A seed must keep producing the same output when shuffle parents nest.
+
+        The expected order is what the original live-tree walk produced for
+        seed 0; visiting nested parents in any other order changes it.
+        """
+        xml = (
+            "<root><node id='n1'>"
+            "<element id='a'><x id='a1'/><x id='a2'/><x id='a3'/></element>"
+            "<element id='b'><x id='b1'/><x id='b2'/><x id='b3'/></element>"
+            "<element id='c'><x id='c1'/><x id='c2'/><x id='c3'/></element>"
+            "</node></root>"
+        )
+        config = ShufflingConfig(enabled=True, seed=0, target_tags=["element", "node"])
+
+        result_xml = shuffle_siblings(xml, config)
+
+        assert etree.fromstring(result_xml.encode(), _PARSER).xpath("//@id") == [
+            "n1", "a", "a3", "a2", "a1", "c", "c1", "c2", "c3", "b", "b1", "b3", "b2",
+        ]
+
+    @pytest.mark.parametrize("seed", [42, 99, 1234])
+    def test_deterministic_shuffling_with_seed(self, sample_xml: str, seed: int):
         """Two shuffles with the same seed must produce identical output."""
-        config = ShufflingConfig(enabled=True, seed=42, target_tags=["element"])
+        config = ShufflingConfig(enabled=True, seed=seed, target_tags=["element"])
 
         result1 = shuffle_siblings(sample_xml, config)
         result2 = shuffle_siblings(sample_xml, config)
@@ -110,30 +165,34 @@ class TestDeterministicShuffling:
             "Deterministic shuffling with same seed should produce identical results"
         )
 
-    def test_different_seeds_produce_different_output(self, sample_xml: str):
+    def test_different_seeds_produce_different_output(
+        self,
+        sample_xml: str,
+        config_seed42: ShufflingConfig,
+        config_seed99: ShufflingConfig,
+    ):
         """Two shuffles with different seeds should (very likely) differ."""
-        config_a = ShufflingConfig(enabled=True, seed=42, target_tags=["element"])
-        config_b = ShufflingConfig(enabled=True, seed=99, target_tags=["element"])
-
-        result_a = shuffle_siblings(sample_xml, config_a)
-        result_b = shuffle_siblings(sample_xml, config_b)
+        result_a = shuffle_siblings(sample_xml, config_seed42)
+        result_b = shuffle_siblings(sample_xml, config_seed99)
 
         # With only 2 elements this may sometimes be the same, so we just check
         # that the function accepts different seeds without error.
         # For larger element sets this would be a stronger assertion.
-        assert isinstance(result_a, str) and isinstance(result_b, str)
+        assert type(result_a) is str and type(result_b) is str
 
-    def test_shuffling_disabled(self, sample_xml: str):
+    def test_shuffling_disabled(
+        self,
+        sample_xml: str,
+        sample_element_ids: tuple[str, ...],
+        config_disabled: ShufflingConfig,
+    ):
         """When shuffling is disabled, element order must not change."""
-        config = ShufflingConfig(enabled=False)
-        result_xml = shuffle_siblings(sample_xml, config)
+        result_xml = shuffle_siblings(sample_xml, config_disabled)
 
-        original_tree = etree.fromstring(sample_xml.encode())
-        result_tree = etree.fromstring(result_xml.encode())
+        result_tree = etree.fromstring(result_xml.encode(), _PARSER)
 
-        original_ids = [e.get("id") for e in original_tree.findall("element")]
-        result_ids = [e.get("id") for e in result_tree.findall("element")]
+        result_ids = tuple(_ELEMENT_IDS(result_tree))
 
-        assert original_ids == result_ids, (
+        assert sample_element_ids == result_ids, (
             "Disabled shuffling should preserve original order"
         )